@@ -23,6 +23,7 @@ setup(
             "stencilforge=stencilforge.cli:main",
             "stencilforge-ui=stencilforge.ui_app:main",
             "stencilforge-ui-vtk=stencilforge.ui_vtk_app:main",
+            "stencilforge-sfmesh-regression=stencilforge.tools.regression:main",
         ]
     },
 )
@@ -1,17 +1,100 @@
 from __future__ import annotations
 
+import fnmatch
+import functools
+import hashlib
 import json
+import mmap
 import os
+import re
+import shutil
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable
+
+try:
+    import orjson
+except ImportError:  # 可选依赖：缺失时回退到标准库 json
+    orjson = None
+
+# 两者都直接接受 bytes，省去先解码成 str 的一步
+_json_loads = orjson.loads if orjson is not None else json.loads
+# 小于该大小的配置整读更快，mmap 的建立/解除映射开销不值得
+_MMAP_MIN_BYTES = 4096
 
 DEFAULT_PASTE_PATTERNS = ["*gtp*", "*gbp*", "*paste*top*", "*paste*bottom*", "*cream*"]
 DEFAULT_OUTLINE_PATTERNS = ["*gko*", "*gm1*", "*boardoutline*", "*outline*", "*edge*cuts*"]
 
+_OUTPUT_MODES = frozenset({"holes_only", "solid_with_cutouts"})
+# sfmesh 为已弃用别名：from_dict 会归一化为 trimesh，get_model_engine 同样接受
+_MODEL_BACKENDS = frozenset({"trimesh", "cadquery", "sfmesh"})
+_SFMESH_QUALITY_MODES = frozenset({"fast", "auto", "watertight"})
+# stl_quality 预设：(linear_deflection, angular_deflection)
+_STL_PRESETS = {
+    "fast": (0.2, 0.35),
+    "balanced": (0.05, 0.1),
+    "high_quality": (0.02, 0.05),
+}
+_STL_QUALITIES = frozenset(_STL_PRESETS)
+_LOCATOR_MODES = frozenset({"step", "wall"})
+_LOCATOR_OPEN_SIDES = frozenset({"none", "top", "right", "bottom", "left"})
+_OUTLINE_FILL_RULES = frozenset({"legacy", "evenodd"})
+_OUTLINE_CLOSE_STRATEGIES = frozenset({"legacy", "graph", "robust_polygonize"})
+
+# validate 的规则表：数值下限与枚举取值，错误信息与逐项判断时保持一致
+_POSITIVE_FIELDS = (
+    "thickness_mm",
+    "qfn_min_feature_mm",
+    "qfn_max_pad_width_mm",
+    "sfmesh_voxel_pitch_mm",
+    "sfmesh_adaptive_pitch_min_mm",
+    "sfmesh_adaptive_pitch_max_mm",
+    "sfmesh_watertight_face_limit",
+    "sfmesh_hole_protect_max_width_mm",
+    "sfmesh_chunk_size_mm",
+    "stl_linear_deflection",
+    "stl_angular_deflection",
+    "outline_snap_eps_mm",
+    "outline_arc_max_chord_error_mm",
+)
+_NON_NEGATIVE_FIELDS = (
+    "sfmesh_simplify_tol_mm",
+    "sfmesh_min_polygon_area_mm2",
+    "sfmesh_min_hole_area_mm2",
+    "sfmesh_chunk_overlap_mm",
+    "stl_tolerance",
+    "locator_height_mm",
+    "locator_width_mm",
+    "locator_clearance_mm",
+    "locator_step_height_mm",
+    "locator_step_width_mm",
+    "locator_open_width_mm",
+    "outline_merge_tol_mm",
+    "outline_gap_bridge_mm",
+    "cadquery_simplify_tol_mm",
+    "cadquery_short_edge_min_mm",
+    "cadquery_quantize_mm",
+    "ui_debug_plot_max_segments",
+    "ui_debug_plot_max_offset_vectors",
+    "ui_debug_plot_offset_min_mm",
+)
+_CHOICE_FIELDS = (
+    ("output_mode", _OUTPUT_MODES, "output_mode must be holes_only or solid_with_cutouts"),
+    ("model_backend", _MODEL_BACKENDS, "model_backend must be trimesh or cadquery"),
+    ("sfmesh_quality_mode", _SFMESH_QUALITY_MODES, "sfmesh_quality_mode must be fast, auto, or watertight"),
+    ("locator_mode", _LOCATOR_MODES, "locator_mode must be step or wall"),
+    ("locator_open_side", _LOCATOR_OPEN_SIDES, "locator_open_side must be none/top/right/bottom/left"),
+    ("outline_fill_rule", _OUTLINE_FILL_RULES, "outline_fill_rule must be legacy or evenodd"),
+    (
+        "outline_close_strategy",
+        _OUTLINE_CLOSE_STRATEGIES,
+        "outline_close_strategy must be legacy, graph, or robust_polygonize",
+    ),
+)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True, init=False, repr=False, eq=False)
 class StencilConfig:
     paste_patterns: list[str]
     outline_patterns: list[str]
@@ -68,22 +151,83 @@ class StencilConfig:
     ui_debug_plot_max_segments: int
     ui_debug_plot_max_offset_vectors: int
     ui_debug_plot_offset_min_mm: float
+    # 以下为构造时派生的缓存字段，不参与 __init__/比较/repr
+    _paste_re: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _outline_re: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _digest: bytes = field(init=False, repr=False, compare=False)
+    _validated: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def __init__(self, **values: Any) -> None:
+        # 手写构造：按字段表直接写槽位，省去生成的 __init__ 对几十个关键字参数的逐一绑定
+        setattr_ = object.__setattr__
+        try:
+            for name in _FIELD_NAMES:
+                setattr_(self, name, values.pop(name))
+        except KeyError as exc:
+            raise TypeError(f"StencilConfig() missing field {exc.args[0]!r}") from None
+        if values:
+            raise TypeError(f"StencilConfig() got unexpected fields: {', '.join(sorted(values))}")
+        # 预编译文件名通配符：每个文件名只需一次正则匹配
+        setattr_(self, "_paste_re", compile_name_patterns(self.paste_patterns))
+        setattr_(self, "_outline_re", compile_name_patterns(self.outline_patterns))
+        # 全部配置项的内容摘要只算一次，供缓存键与 __hash__ 复用
+        field_values = tuple(getattr(self, name) for name in _FIELD_NAMES)
+        setattr_(self, "_digest", hashlib.sha256(repr(field_values).encode("utf-8")).digest())
+        setattr_(self, "_validated", False)
+
+    def __eq__(self, other: object) -> bool:
+        # 摘要覆盖全部字段，比较 32 字节即可，且与 __hash__ 天然一致
+        if other.__class__ is not StencilConfig:
+            return NotImplemented
+        return self is other or self._digest == other._digest
+
+    def __hash__(self) -> int:
+        return hash(self._digest)
+
+    def __repr__(self) -> str:
+        # 只列出与默认值不同的字段，日志中一眼可见实际改动
+        changed = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in _FIELD_NAMES
+            if getattr(self, name) != _REPR_DEFAULTS[name]
+        )
+        return f"StencilConfig({changed})"
+
+    @property
+    def digest(self) -> bytes:
+        return self._digest
+
+    def match_paste(self, name: str) -> bool:
+        return name_matches(self._paste_re, name)
+
+    def match_outline(self, name: str) -> bool:
+        return name_matches(self._outline_re, name)
 
     @staticmethod
     def default_path(project_root: Path) -> Path:
-        return _user_config_dir() / "stencilforge.json"
+        return _user_config_path()
 
     @staticmethod
     def load_default(project_root: Path) -> "StencilConfig":
         user_path = StencilConfig.default_path(project_root)
-        if user_path.exists():
-            return StencilConfig.from_json(user_path)
+        try:
+            stat = user_path.stat()
+        except FileNotFoundError:
+            stat = None
+        if stat is not None:
+            # 文件未变化时直接复用已解析的实例（冻结对象，可安全共享）
+            return _load_json_cached(user_path, stat.st_mtime_ns, stat.st_size)
         bundled_path = _find_bundled_config(project_root)
         if bundled_path is not None:
-            config = StencilConfig.from_json(bundled_path)
+            # 解析用内存中的字节；落盘交给 copyfile（内核 sendfile，不经 Python 缓冲）
+            try:
+                raw = bundled_path.read_bytes()
+            except FileNotFoundError:
+                return StencilConfig.from_dict({})
+            config = StencilConfig.from_bytes(raw)
             try:
                 user_path.parent.mkdir(parents=True, exist_ok=True)
-                user_path.write_text(bundled_path.read_text(encoding="utf-8"), encoding="utf-8")
+                shutil.copyfile(bundled_path, user_path)
             except OSError:
                 pass
             return config
@@ -92,239 +236,113 @@ class StencilConfig:
     @staticmethod
     def from_json(path: Path) -> "StencilConfig":
         try:
-            raw = path.read_text(encoding="utf-8")
+            with open(path, "rb") as fh:
+                size = os.fstat(fh.fileno()).st_size
+                if orjson is not None and size >= _MMAP_MIN_BYTES:
+                    # 较大的配置直接把映射的页缓存交给 orjson，省去一次整文件拷贝
+                    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        return StencilConfig.from_bytes(view)
+                raw = fh.read()
         except FileNotFoundError:
             return StencilConfig.from_dict({})
+        return StencilConfig.from_bytes(raw)
+
+    @staticmethod
+    def from_bytes(raw: bytes | memoryview) -> "StencilConfig":
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+            data = _json_loads(raw)
+        except ValueError:
+            # orjson/json 的解析错误及非法 UTF-8 都是 ValueError 子类
             return StencilConfig.from_dict({})
         return StencilConfig.from_dict(data)
 
     @staticmethod
     def from_dict(data: dict) -> "StencilConfig":
-        paste_patterns = _ensure_list(data.get("paste_patterns", [])) or list(DEFAULT_PASTE_PATTERNS)
-        outline_patterns = _ensure_list(data.get("outline_patterns", [])) or list(DEFAULT_OUTLINE_PATTERNS)
-        thickness_mm = float(data.get("thickness_mm", 0.12))
-        paste_offset_mm = float(data.get("paste_offset_mm", -0.05))
-        outline_margin_mm = float(data.get("outline_margin_mm", 5.0))
-        locator_enabled = bool(data.get("locator_enabled", True))
-        locator_height_mm = float(data.get("locator_height_mm", 2.0))
-        locator_width_mm = float(data.get("locator_width_mm", 2.0))
-        locator_clearance_mm = float(data.get("locator_clearance_mm", 0.2))
-        locator_step_height_mm = float(data.get("locator_step_height_mm", 1.0))
-        locator_step_width_mm = float(data.get("locator_step_width_mm", 1.5))
-        locator_mode = str(data.get("locator_mode", "step"))
-        locator_open_side = str(data.get("locator_open_side", "none"))
-        locator_open_width_mm = float(data.get("locator_open_width_mm", 0.0))
-        output_mode = str(data.get("output_mode", "solid_with_cutouts"))
-        model_backend = str(data.get("model_backend", "trimesh")).strip().lower()
-        if model_backend == "sfmesh":
-            model_backend = "trimesh"
-        sfmesh_quality_mode = str(data.get("sfmesh_quality_mode", "fast"))
-        sfmesh_voxel_pitch_mm = float(data.get("sfmesh_voxel_pitch_mm", 0.08))
-        sfmesh_adaptive_pitch_enabled = bool(data.get("sfmesh_adaptive_pitch_enabled", True))
-        sfmesh_adaptive_pitch_min_mm = float(data.get("sfmesh_adaptive_pitch_min_mm", 0.08))
-        sfmesh_adaptive_pitch_max_mm = float(data.get("sfmesh_adaptive_pitch_max_mm", 0.24))
-        sfmesh_watertight_face_limit = int(data.get("sfmesh_watertight_face_limit", 250000))
-        sfmesh_simplify_tol_mm = float(data.get("sfmesh_simplify_tol_mm", 0.0))
-        sfmesh_min_polygon_area_mm2 = float(data.get("sfmesh_min_polygon_area_mm2", 0.0))
-        sfmesh_min_hole_area_mm2 = float(data.get("sfmesh_min_hole_area_mm2", 0.0))
-        sfmesh_decimate_target_ratio = float(data.get("sfmesh_decimate_target_ratio", 1.0))
-        sfmesh_hole_protect_enabled = bool(data.get("sfmesh_hole_protect_enabled", True))
-        sfmesh_hole_protect_max_width_mm = float(data.get("sfmesh_hole_protect_max_width_mm", 0.8))
-        sfmesh_hole_pitch_divisor = float(data.get("sfmesh_hole_pitch_divisor", 3.0))
-        sfmesh_chunked_watertight_enabled = bool(data.get("sfmesh_chunked_watertight_enabled", True))
-        sfmesh_chunk_size_mm = float(data.get("sfmesh_chunk_size_mm", 70.0))
-        sfmesh_chunk_overlap_mm = float(data.get("sfmesh_chunk_overlap_mm", 1.0))
-        stl_quality = str(data.get("stl_quality", "balanced"))
-        stl_linear_deflection = float(data.get("stl_linear_deflection", 0.05))
-        stl_angular_deflection = float(data.get("stl_angular_deflection", 0.1))
-        stl_tolerance = float(data.get("stl_tolerance", 0.0))
-        stl_presets = {
-            "fast": (0.2, 0.35),
-            "balanced": (0.05, 0.1),
-            "high_quality": (0.02, 0.05),
-        }
-        if stl_quality in stl_presets:
-            preset_linear, preset_angular = stl_presets[stl_quality]
+        kwargs = {name: conv(data[name]) if name in data else default for name, conv, default in _FIELDS}
+        # 空的通配符列表回退到内置默认值（每个实例各持一份副本）
+        kwargs["paste_patterns"] = kwargs["paste_patterns"] or list(DEFAULT_PASTE_PATTERNS)
+        kwargs["outline_patterns"] = kwargs["outline_patterns"] or list(DEFAULT_OUTLINE_PATTERNS)
+        preset = _STL_PRESETS.get(kwargs["stl_quality"])
+        if preset is not None:
             if "stl_linear_deflection" not in data:
-                stl_linear_deflection = preset_linear
+                kwargs["stl_linear_deflection"] = preset[0]
             if "stl_angular_deflection" not in data:
-                stl_angular_deflection = preset_angular
-        arc_steps = int(data.get("arc_steps", 64))
-        curve_resolution = int(data.get("curve_resolution", 16))
-        qfn_regen_enabled = bool(data.get("qfn_regen_enabled", True))
-        qfn_min_feature_mm = float(data.get("qfn_min_feature_mm", 0.6))
-        qfn_confidence_threshold = float(data.get("qfn_confidence_threshold", 0.75))
-        qfn_max_pad_width_mm = float(data.get("qfn_max_pad_width_mm", 1.2))
-        outline_fill_rule = str(data.get("outline_fill_rule", "evenodd"))
-        outline_close_strategy = str(data.get("outline_close_strategy", "legacy"))
-        outline_merge_tol_mm = float(data.get("outline_merge_tol_mm", 0.01))
-        outline_snap_eps_mm = float(data.get("outline_snap_eps_mm", 0.001))
-        outline_arc_max_chord_error_mm = float(data.get("outline_arc_max_chord_error_mm", 0.01))
-        outline_gap_bridge_mm = float(data.get("outline_gap_bridge_mm", 0.05))
-        cadquery_simplify_tol_mm = float(data.get("cadquery_simplify_tol_mm", 0.0))
-        cadquery_short_edge_min_mm = float(data.get("cadquery_short_edge_min_mm", 0.0001))
-        cadquery_quantize_mm = float(data.get("cadquery_quantize_mm", 0.00001))
-        ui_debug_plot_outline = bool(data.get("ui_debug_plot_outline", False))
-        ui_debug_plot_max_segments = int(data.get("ui_debug_plot_max_segments", 20000))
-        ui_debug_plot_max_offset_vectors = int(data.get("ui_debug_plot_max_offset_vectors", 800))
-        ui_debug_plot_offset_min_mm = float(data.get("ui_debug_plot_offset_min_mm", 0.0))
-        return StencilConfig(
-            paste_patterns=paste_patterns,
-            outline_patterns=outline_patterns,
-            thickness_mm=thickness_mm,
-            paste_offset_mm=paste_offset_mm,
-            outline_margin_mm=outline_margin_mm,
-            locator_enabled=locator_enabled,
-            locator_height_mm=locator_height_mm,
-            locator_width_mm=locator_width_mm,
-            locator_clearance_mm=locator_clearance_mm,
-            locator_step_height_mm=locator_step_height_mm,
-            locator_step_width_mm=locator_step_width_mm,
-            locator_mode=locator_mode,
-            locator_open_side=locator_open_side,
-            locator_open_width_mm=locator_open_width_mm,
-            output_mode=output_mode,
-            model_backend=model_backend,
-            sfmesh_quality_mode=sfmesh_quality_mode,
-            sfmesh_voxel_pitch_mm=sfmesh_voxel_pitch_mm,
-            sfmesh_adaptive_pitch_enabled=sfmesh_adaptive_pitch_enabled,
-            sfmesh_adaptive_pitch_min_mm=sfmesh_adaptive_pitch_min_mm,
-            sfmesh_adaptive_pitch_max_mm=sfmesh_adaptive_pitch_max_mm,
-            sfmesh_watertight_face_limit=sfmesh_watertight_face_limit,
-            sfmesh_simplify_tol_mm=sfmesh_simplify_tol_mm,
-            sfmesh_min_polygon_area_mm2=sfmesh_min_polygon_area_mm2,
-            sfmesh_min_hole_area_mm2=sfmesh_min_hole_area_mm2,
-            sfmesh_decimate_target_ratio=sfmesh_decimate_target_ratio,
-            sfmesh_hole_protect_enabled=sfmesh_hole_protect_enabled,
-            sfmesh_hole_protect_max_width_mm=sfmesh_hole_protect_max_width_mm,
-            sfmesh_hole_pitch_divisor=sfmesh_hole_pitch_divisor,
-            sfmesh_chunked_watertight_enabled=sfmesh_chunked_watertight_enabled,
-            sfmesh_chunk_size_mm=sfmesh_chunk_size_mm,
-            sfmesh_chunk_overlap_mm=sfmesh_chunk_overlap_mm,
-            stl_quality=stl_quality,
-            stl_linear_deflection=stl_linear_deflection,
-            stl_angular_deflection=stl_angular_deflection,
-            stl_tolerance=stl_tolerance,
-            arc_steps=arc_steps,
-            curve_resolution=curve_resolution,
-            qfn_regen_enabled=qfn_regen_enabled,
-            qfn_min_feature_mm=qfn_min_feature_mm,
-            qfn_confidence_threshold=qfn_confidence_threshold,
-            qfn_max_pad_width_mm=qfn_max_pad_width_mm,
-            outline_fill_rule=outline_fill_rule,
-            outline_close_strategy=outline_close_strategy,
-            outline_merge_tol_mm=outline_merge_tol_mm,
-            outline_snap_eps_mm=outline_snap_eps_mm,
-            outline_arc_max_chord_error_mm=outline_arc_max_chord_error_mm,
-            outline_gap_bridge_mm=outline_gap_bridge_mm,
-            cadquery_simplify_tol_mm=cadquery_simplify_tol_mm,
-            cadquery_short_edge_min_mm=cadquery_short_edge_min_mm,
-            cadquery_quantize_mm=cadquery_quantize_mm,
-            ui_debug_plot_outline=ui_debug_plot_outline,
-            ui_debug_plot_max_segments=ui_debug_plot_max_segments,
-            ui_debug_plot_max_offset_vectors=ui_debug_plot_max_offset_vectors,
-            ui_debug_plot_offset_min_mm=ui_debug_plot_offset_min_mm,
-        )
+                kwargs["stl_angular_deflection"] = preset[1]
+        return StencilConfig(**kwargs)
 
     def validate(self) -> None:
-        if self.thickness_mm <= 0:
-            raise ValueError("thickness_mm must be > 0")
+        # 冻结实例的校验结果不会变化，通过一次后直接返回
+        if self._validated:
+            return
+        for name in _POSITIVE_FIELDS:
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be > 0")
+        for name in _NON_NEGATIVE_FIELDS:
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must be >= 0")
+        for name, allowed, message in _CHOICE_FIELDS:
+            if getattr(self, name) not in allowed:
+                raise ValueError(message)
         if self.arc_steps < 8:
             raise ValueError("arc_steps must be >= 8")
         if self.curve_resolution < 4:
             raise ValueError("curve_resolution must be >= 4")
-        if self.qfn_min_feature_mm <= 0:
-            raise ValueError("qfn_min_feature_mm must be > 0")
         if not 0.0 < self.qfn_confidence_threshold <= 1.0:
             raise ValueError("qfn_confidence_threshold must be in (0, 1]")
-        if self.qfn_max_pad_width_mm <= 0:
-            raise ValueError("qfn_max_pad_width_mm must be > 0")
-        if self.output_mode not in {"holes_only", "solid_with_cutouts"}:
-            raise ValueError("output_mode must be holes_only or solid_with_cutouts")
-        if self.model_backend not in {"trimesh", "cadquery"}:
-            raise ValueError("model_backend must be trimesh or cadquery")
-        if self.sfmesh_quality_mode not in {"fast", "auto", "watertight"}:
-            raise ValueError("sfmesh_quality_mode must be fast, auto, or watertight")
-        if self.sfmesh_voxel_pitch_mm <= 0:
-            raise ValueError("sfmesh_voxel_pitch_mm must be > 0")
-        if self.sfmesh_adaptive_pitch_min_mm <= 0:
-            raise ValueError("sfmesh_adaptive_pitch_min_mm must be > 0")
-        if self.sfmesh_adaptive_pitch_max_mm <= 0:
-            raise ValueError("sfmesh_adaptive_pitch_max_mm must be > 0")
         if self.sfmesh_adaptive_pitch_min_mm > self.sfmesh_adaptive_pitch_max_mm:
             raise ValueError("sfmesh_adaptive_pitch_min_mm must be <= sfmesh_adaptive_pitch_max_mm")
-        if self.sfmesh_watertight_face_limit <= 0:
-            raise ValueError("sfmesh_watertight_face_limit must be > 0")
-        if self.sfmesh_simplify_tol_mm < 0:
-            raise ValueError("sfmesh_simplify_tol_mm must be >= 0")
-        if self.sfmesh_min_polygon_area_mm2 < 0:
-            raise ValueError("sfmesh_min_polygon_area_mm2 must be >= 0")
-        if self.sfmesh_min_hole_area_mm2 < 0:
-            raise ValueError("sfmesh_min_hole_area_mm2 must be >= 0")
         if not 0 < self.sfmesh_decimate_target_ratio <= 1:
             raise ValueError("sfmesh_decimate_target_ratio must be in (0, 1]")
-        if self.sfmesh_hole_protect_max_width_mm <= 0:
-            raise ValueError("sfmesh_hole_protect_max_width_mm must be > 0")
         if self.sfmesh_hole_pitch_divisor <= 1:
             raise ValueError("sfmesh_hole_pitch_divisor must be > 1")
-        if self.sfmesh_chunk_size_mm <= 0:
-            raise ValueError("sfmesh_chunk_size_mm must be > 0")
-        if self.sfmesh_chunk_overlap_mm < 0:
-            raise ValueError("sfmesh_chunk_overlap_mm must be >= 0")
-        if self.stl_linear_deflection <= 0:
-            raise ValueError("stl_linear_deflection must be > 0")
-        if self.stl_angular_deflection <= 0:
-            raise ValueError("stl_angular_deflection must be > 0")
-        if self.stl_tolerance < 0:
-            raise ValueError("stl_tolerance must be >= 0")
-        if self.stl_quality and self.stl_quality not in ("fast", "balanced", "high_quality"):
+        if self.stl_quality and self.stl_quality not in _STL_QUALITIES:
             raise ValueError("stl_quality must be fast, balanced, or high_quality")
-        if self.locator_height_mm < 0:
-            raise ValueError("locator_height_mm must be >= 0")
-        if self.locator_width_mm < 0:
-            raise ValueError("locator_width_mm must be >= 0")
-        if self.locator_clearance_mm < 0:
-            raise ValueError("locator_clearance_mm must be >= 0")
-        if self.locator_step_height_mm < 0:
-            raise ValueError("locator_step_height_mm must be >= 0")
-        if self.locator_step_width_mm < 0:
-            raise ValueError("locator_step_width_mm must be >= 0")
-        if self.locator_mode not in {"step", "wall"}:
-            raise ValueError("locator_mode must be step or wall")
         if self.locator_step_height_mm > 0 and self.locator_height_mm > 0:
             if self.locator_step_height_mm > self.locator_height_mm:
                 raise ValueError("locator_step_height_mm must be <= locator_height_mm")
-        if self.locator_open_width_mm < 0:
-            raise ValueError("locator_open_width_mm must be >= 0")
-        if self.locator_open_side not in {"none", "top", "right", "bottom", "left"}:
-            raise ValueError("locator_open_side must be none/top/right/bottom/left")
-        if self.outline_fill_rule not in {"legacy", "evenodd"}:
-            raise ValueError("outline_fill_rule must be legacy or evenodd")
-        if self.outline_close_strategy not in {"legacy", "graph", "robust_polygonize"}:
-            raise ValueError("outline_close_strategy must be legacy, graph, or robust_polygonize")
-        if self.outline_merge_tol_mm < 0:
-            raise ValueError("outline_merge_tol_mm must be >= 0")
-        if self.outline_snap_eps_mm <= 0:
-            raise ValueError("outline_snap_eps_mm must be > 0")
-        if self.outline_arc_max_chord_error_mm <= 0:
-            raise ValueError("outline_arc_max_chord_error_mm must be > 0")
-        if self.outline_gap_bridge_mm < 0:
-            raise ValueError("outline_gap_bridge_mm must be >= 0")
-        if self.cadquery_simplify_tol_mm < 0:
-            raise ValueError("cadquery_simplify_tol_mm must be >= 0")
-        if self.cadquery_short_edge_min_mm < 0:
-            raise ValueError("cadquery_short_edge_min_mm must be >= 0")
-        if self.cadquery_quantize_mm < 0:
-            raise ValueError("cadquery_quantize_mm must be >= 0")
-        if self.ui_debug_plot_max_segments < 0:
-            raise ValueError("ui_debug_plot_max_segments must be >= 0")
-        if self.ui_debug_plot_max_offset_vectors < 0:
-            raise ValueError("ui_debug_plot_max_offset_vectors must be >= 0")
-        if self.ui_debug_plot_offset_min_mm < 0:
-            raise ValueError("ui_debug_plot_offset_min_mm must be >= 0")
+        object.__setattr__(self, "_validated", True)
+
+
+def compile_name_patterns(patterns: Iterable[str]) -> re.Pattern[str] | None:
+    """将 fnmatch 通配符列表合并为一个不区分大小写的正则；空列表返回 None。"""
+    return _compile_name_patterns(tuple(patterns))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_name_patterns(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    # fnmatch.translate 是纯 Python 实现，相同的通配符列表只翻译一次
+    parts = [f"(?:{fnmatch.translate(pattern.lower())})" for pattern in patterns]
+    if not parts:
+        return None
+    return re.compile("|".join(parts))
+
+
+def name_matches(pattern: re.Pattern[str] | None, name: str) -> bool:
+    return pattern is not None and pattern.match(name.lower()) is not None
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path: Path, mtime_ns: int, size: int) -> StencilConfig:
+    return StencilConfig.from_json(path)
+
+
+def clear_config_cache() -> None:
+    _load_json_cached.cache_clear()
+    _user_config_dir.cache_clear()
+    _user_config_path.cache_clear()
+    _find_bundled_config.cache_clear()
+    _frozen_config_candidates.cache_clear()
+
+
+def _enum_str(value: Any) -> str:
+    # 枚举型字符串驻留后，与常量的比较在 CPython 中走指针相等的快速路径
+    return sys.intern(str(value))
+
+
+def _normalize_backend(value: Any) -> str:
+    backend = str(value).strip().lower()
+    # 旧配置中的 sfmesh 后端已并入 trimesh
+    return "trimesh" if backend == "sfmesh" else sys.intern(backend)
 
 
 def _ensure_list(value: Iterable[str] | str | None) -> list[str]:
@@ -335,31 +353,109 @@ def _ensure_list(value: Iterable[str] | str | None) -> list[str]:
     return list(value)
 
 
+# from_dict 的字段表：(字段名, 类型转换, 默认值)，缺省时直接使用默认值
+_FIELDS: tuple[tuple[str, Callable[[Any], Any], Any], ...] = (
+    ("paste_patterns", _ensure_list, ()),
+    ("outline_patterns", _ensure_list, ()),
+    ("thickness_mm", float, 0.12),
+    ("paste_offset_mm", float, -0.05),
+    ("outline_margin_mm", float, 5.0),
+    ("locator_enabled", bool, True),
+    ("locator_height_mm", float, 2.0),
+    ("locator_width_mm", float, 2.0),
+    ("locator_clearance_mm", float, 0.2),
+    ("locator_step_height_mm", float, 1.0),
+    ("locator_step_width_mm", float, 1.5),
+    ("locator_mode", _enum_str, "step"),
+    ("locator_open_side", _enum_str, "none"),
+    ("locator_open_width_mm", float, 0.0),
+    ("output_mode", _enum_str, "solid_with_cutouts"),
+    ("model_backend", _normalize_backend, "trimesh"),
+    ("sfmesh_quality_mode", _enum_str, "fast"),
+    ("sfmesh_voxel_pitch_mm", float, 0.08),
+    ("sfmesh_adaptive_pitch_enabled", bool, True),
+    ("sfmesh_adaptive_pitch_min_mm", float, 0.08),
+    ("sfmesh_adaptive_pitch_max_mm", float, 0.24),
+    ("sfmesh_watertight_face_limit", int, 250000),
+    ("sfmesh_simplify_tol_mm", float, 0.0),
+    ("sfmesh_min_polygon_area_mm2", float, 0.0),
+    ("sfmesh_min_hole_area_mm2", float, 0.0),
+    ("sfmesh_decimate_target_ratio", float, 1.0),
+    ("sfmesh_hole_protect_enabled", bool, True),
+    ("sfmesh_hole_protect_max_width_mm", float, 0.8),
+    ("sfmesh_hole_pitch_divisor", float, 3.0),
+    ("sfmesh_chunked_watertight_enabled", bool, True),
+    ("sfmesh_chunk_size_mm", float, 70.0),
+    ("sfmesh_chunk_overlap_mm", float, 1.0),
+    ("stl_quality", _enum_str, "balanced"),
+    ("stl_linear_deflection", float, 0.05),
+    ("stl_angular_deflection", float, 0.1),
+    ("stl_tolerance", float, 0.0),
+    ("arc_steps", int, 64),
+    ("curve_resolution", int, 16),
+    ("qfn_regen_enabled", bool, True),
+    ("qfn_min_feature_mm", float, 0.6),
+    ("qfn_confidence_threshold", float, 0.75),
+    ("qfn_max_pad_width_mm", float, 1.2),
+    ("outline_fill_rule", _enum_str, "evenodd"),
+    ("outline_close_strategy", _enum_str, "legacy"),
+    ("outline_merge_tol_mm", float, 0.01),
+    ("outline_snap_eps_mm", float, 0.001),
+    ("outline_arc_max_chord_error_mm", float, 0.01),
+    ("outline_gap_bridge_mm", float, 0.05),
+    ("cadquery_simplify_tol_mm", float, 0.0),
+    ("cadquery_short_edge_min_mm", float, 0.0001),
+    ("cadquery_quantize_mm", float, 0.00001),
+    ("ui_debug_plot_outline", bool, False),
+    ("ui_debug_plot_max_segments", int, 20000),
+    ("ui_debug_plot_max_offset_vectors", int, 800),
+    ("ui_debug_plot_offset_min_mm", float, 0.0),
+)
+_FIELD_NAMES = tuple(name for name, _, _ in _FIELDS)
+_REPR_DEFAULTS = {
+    **{name: default for name, _, default in _FIELDS},
+    "paste_patterns": DEFAULT_PASTE_PATTERNS,
+    "outline_patterns": DEFAULT_OUTLINE_PATTERNS,
+}
+
+
+@functools.lru_cache(maxsize=1)
 def _user_config_dir() -> Path:
+    # 配置目录在进程生命周期内不变，解析一次即可
+    environ = os.environ
     if os.name == "nt":
-        base = os.environ.get("APPDATA") or os.environ.get("USERPROFILE")
+        base = environ.get("APPDATA") or environ.get("USERPROFILE")
         if base:
             return Path(base) / "StencilForge"
-    base = os.environ.get("XDG_CONFIG_HOME")
+    base = environ.get("XDG_CONFIG_HOME")
     if base:
         return Path(base) / "stencilforge"
     return Path.home() / ".config" / "stencilforge"
 
 
+@functools.lru_cache(maxsize=1)
+def _user_config_path() -> Path:
+    return _user_config_dir() / "stencilforge.json"
+
+
+@functools.lru_cache(maxsize=8)
 def _find_bundled_config(project_root: Path) -> Path | None:
-    candidates = [
-        project_root / "config" / "stencilforge.json",
-    ]
-    if getattr(sys, "frozen", False):
-        base = Path(getattr(sys, "_MEIPASS", project_root))
-        exe_dir = Path(sys.executable).resolve().parent
-        candidates.extend(
-            [
-                base / "config" / "stencilforge.json",
-                exe_dir / "config" / "stencilforge.json",
-            ]
-        )
+    candidates = (project_root / "config" / "stencilforge.json", *_frozen_config_candidates())
     for candidate in candidates:
         if candidate.exists():
             return candidate
     return None
+
+
+@functools.lru_cache(maxsize=1)
+def _frozen_config_candidates() -> tuple[Path, ...]:
+    # 打包运行时的候选位置只取决于 sys 属性，进程内解析一次（含 resolve 的 realpath 调用）
+    if not getattr(sys, "frozen", False):
+        return ()
+    candidates = []
+    meipass = getattr(sys, "_MEIPASS", None)
+    if meipass is not None:
+        # 无 _MEIPASS 时原先回退到 project_root，与首个候选重复，故省略
+        candidates.append(Path(meipass) / "config" / "stencilforge.json")
+    candidates.append(Path(sys.executable).resolve().parent / "config" / "stencilforge.json")
+    return tuple(candidates)
@@ -1,7 +1,33 @@
 """几何子模块导出集合。"""
 
-from .primitives import PrimitiveGeometryBuilder
-from .outline import OutlineBuilder
-from .service import GerberGeometryService
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .outline import OutlineBuilder
+    from .primitives import PrimitiveGeometryBuilder
+    from .service import GerberGeometryService
 
 __all__ = ["GerberGeometryService", "OutlineBuilder", "PrimitiveGeometryBuilder"]
+
+# 导出名 -> 子模块；首次访问时才导入（PEP 562），import 本包本身几乎零开销
+_LAZY_EXPORTS = {
+    "GerberGeometryService": ".service",
+    "OutlineBuilder": ".outline",
+    "PrimitiveGeometryBuilder": ".primitives",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
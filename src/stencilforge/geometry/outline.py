@@ -3,16 +3,20 @@ from __future__ import annotations
 """板框解析：从 Gerber 线段/圆弧构建闭合轮廓并填充。"""
 
 import argparse
+import functools
+import itertools
 import math
 import logging
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict
 
+import numpy as np
+import shapely
 from gerber import primitives as gprim
 from gerber import load_layer
 from shapely import affinity
-from shapely.geometry import LineString, MultiLineString, Point, Polygon
+from shapely.geometry import LineString, Polygon
 from shapely.strtree import STRtree
 from shapely.ops import linemerge, polygonize, unary_union
 
@@ -25,8 +29,33 @@ logger = logging.getLogger(__name__)
 Point2D = tuple[float, float]
 Segment2D = tuple[Point2D, Point2D]
 
+# 图元类型 -> 处理类别：热循环里按 type() 精确查表代替逐个 isinstance；
+# 子类首次出现时走 isinstance 判定并回填缓存
+_PRIM_LINE = "line"
+_PRIM_ARC = "arc"
+_PRIM_REGION = "region"
+_PRIM_OTHER = "other"
+_PRIMITIVE_KINDS: dict[type, str] = {
+    gprim.Line: _PRIM_LINE,
+    gprim.Arc: _PRIM_ARC,
+    gprim.Region: _PRIM_REGION,
+}
+
+
+def _primitive_kind(prim) -> str:
+    cls = type(prim)
+    kind = _PRIMITIVE_KINDS.get(cls)
+    if kind is None:
+        kind = _PRIM_OTHER
+        for base in (gprim.Line, gprim.Arc, gprim.Region):
+            if issubclass(cls, base):
+                kind = _PRIMITIVE_KINDS[base]
+                break
+        _PRIMITIVE_KINDS[cls] = kind
+    return kind
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RobustOutlineConfig:
     eps_mm: float = 0.001
     arc_max_chord_error_mm: float = 0.01
@@ -54,13 +83,15 @@ class RobustOutlineExtractor:
         self.debug["arc_max_chord_error_mm"] = self.cfg.arc_max_chord_error_mm
         self.debug["raw_segments_count"] = len(segments)
         if self.cfg.collect_debug_data:
-            self.debug["raw_segments"] = self._limit_segments(segments)
+            self.debug["raw_segments"] = self._limit_segments(_segment_tuples(segments))
             self.debug["bbox"] = self._segments_bbox(segments)
-        segments = self._snap_segments(segments)
+        # 吸附只改坐标不删线段，吸附后数量即原始数量
         self.debug["snapped_segments_count"] = len(segments)
         if self.cfg.collect_debug_data:
-            self.debug["snapped_segments"] = self._limit_segments(segments)
-        segments = self._filter_and_dedupe_segments(segments)
+            self.debug["snapped_segments"] = self._limit_segments(
+                self._grid_to_segments(self._snap_to_grid(segments))
+            )
+        segments = self._snap_filter_dedupe(segments)
         self.debug["deduped_segments_count"] = len(segments)
         if self.cfg.collect_debug_data:
             self.debug["deduped_segments"] = self._limit_segments(segments)
@@ -111,38 +142,51 @@ class RobustOutlineExtractor:
             self.debug["chosen_polygon_coords"] = self._polygon_coords(poly)
         return poly
 
-    def _primitives_to_segments(self, primitives) -> list[Segment2D]:
-        segments: list[Segment2D] = []
+    def _primitives_to_segments(self, primitives) -> np.ndarray:
+        # 各图元的折线顶点先收集成数组块，最后一次性拼成 (N, 2, 2) 线段数组；
+        # 相邻的 Line 攒成一段坐标列表再整体转换，避免逐条建小数组
+        chunks: list[np.ndarray] = []
+        line_run: list[tuple[Point2D, Point2D]] = []
+
+        def flush_lines() -> None:
+            if line_run:
+                chunks.append(np.asarray(line_run, dtype=np.float64).reshape(-1, 2, 2))
+                line_run.clear()
+
         for prim in primitives:
-            if isinstance(prim, gprim.Line):
-                segments.append((prim.start, prim.end))
-            elif isinstance(prim, gprim.Arc):
-                points = self._discretize_arc(prim)
-                for i in range(len(points) - 1):
-                    segments.append((points[i], points[i + 1]))
-            elif isinstance(prim, gprim.Region):
+            kind = _primitive_kind(prim)
+            if kind is _PRIM_LINE:
+                line_run.append((prim.start, prim.end))
+            elif kind is _PRIM_ARC:
+                flush_lines()
+                chunks.append(self._polyline_segments(self._discretize_arc(prim)))
+            elif kind is _PRIM_REGION:
+                flush_lines()
                 geom = self._primitive_builder._region_to_shape(prim)
-                segments.extend(self._segments_from_shape(geom))
-        return segments
+                chunks.extend(self._segments_from_shape(geom))
+        flush_lines()
+        if not chunks:
+            return np.empty((0, 2, 2), dtype=np.float64)
+        return np.concatenate(chunks)
 
-    def _segments_from_shape(self, geom) -> list[Segment2D]:
+    def _segments_from_shape(self, geom) -> list[np.ndarray]:
         if geom is None or geom.is_empty:
             return []
-        segments: list[Segment2D] = []
         if geom.geom_type == "Polygon":
-            segments.extend(self._segments_from_ring(list(geom.exterior.coords)))
+            polys = [geom]
         elif geom.geom_type == "MultiPolygon":
-            for poly in geom.geoms:
-                segments.extend(self._segments_from_ring(list(poly.exterior.coords)))
-        return segments
+            polys = list(geom.geoms)
+        else:
+            return []
+        return [self._polyline_segments(shapely.get_coordinates(poly.exterior)) for poly in polys]
 
     @staticmethod
-    def _segments_from_ring(coords: list[Point2D]) -> list[Segment2D]:
-        if len(coords) < 2:
-            return []
-        return [(coords[i], coords[i + 1]) for i in range(len(coords) - 1)]
+    def _polyline_segments(points: np.ndarray) -> np.ndarray:
+        if len(points) < 2:
+            return np.empty((0, 2, 2), dtype=np.float64)
+        return np.stack((points[:-1], points[1:]), axis=1)
 
-    def _discretize_arc(self, arc: gprim.Arc) -> list[Point2D]:
+    def _discretize_arc(self, arc: gprim.Arc) -> np.ndarray:
         if arc.center is None or arc.radius is None:
             raise ValueError("R-arc not supported: missing arc center or radius")
         radius = float(arc.radius)
@@ -159,42 +203,43 @@ class RobustOutlineExtractor:
                 end -= 2 * math.pi
             sweep = start - end
         chord_err = float(self.cfg.arc_max_chord_error_mm)
-        max_angle = 2 * math.acos(max(0.0, 1.0 - chord_err / radius))
+        max_angle = _arc_max_step(radius, chord_err)
         if max_angle <= 0 or math.isnan(max_angle):
             max_angle = sweep
         steps = max(2, int(math.ceil(sweep / max_angle)) + 1)
-        angles = [start + sweep * i / (steps - 1) for i in range(steps)]
-        if arc.direction != "counterclockwise":
-            angles = [start - sweep * i / (steps - 1) for i in range(steps)]
+        # 一次性向量化计算全部采样角与坐标；运算顺序与逐点公式 start ± sweep * i / (steps - 1) 相同
+        offsets = sweep * np.arange(steps, dtype=np.float64) / (steps - 1)
+        angles = start + offsets if arc.direction == "counterclockwise" else start - offsets
         cx, cy = arc.center
-        return [(cx + radius * math.cos(a), cy + radius * math.sin(a)) for a in angles]
+        return np.column_stack((cx + radius * np.cos(angles), cy + radius * np.sin(angles)))
 
-    def _snap_point(self, point: Point2D) -> Point2D:
-        eps = self.cfg.eps_mm
-        return (round(point[0] / eps) * eps, round(point[1] / eps) * eps)
+    def _snap_to_grid(self, segments: np.ndarray) -> np.ndarray:
+        # 整体对 (N, 2, 2) 数组一次性取 eps 网格整数索引，逐点 round 的解释器开销全部下沉到 NumPy
+        return np.rint(np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2) / self.cfg.eps_mm).astype(np.int64)
 
-    def _snap_segments(self, segments: list[Segment2D]) -> list[Segment2D]:
-        return [(self._snap_point(p1), self._snap_point(p2)) for p1, p2 in segments]
-
-    def _filter_and_dedupe_segments(self, segments: list[Segment2D]) -> list[Segment2D]:
-        min_len = self.cfg.eps_mm * self.cfg.min_seg_len_scale
-        deduped: list[Segment2D] = []
-        seen: set[tuple[Point2D, Point2D]] = set()
-        for p1, p2 in segments:
-            if self._segment_length(p1, p2) < min_len:
-                continue
-            key = (p1, p2) if p1 <= p2 else (p2, p1)
-            if key in seen:
-                continue
-            seen.add(key)
-            deduped.append((p1, p2))
-        return deduped
+    def _grid_to_segments(self, grid: np.ndarray) -> list[Segment2D]:
+        # 整数索引乘回 eps 与 round(x / eps) * eps 逐位一致，且不会产生 -0.0
+        return _segment_tuples(grid * self.cfg.eps_mm)
 
-    @staticmethod
-    def _segment_length(p1: Point2D, p2: Point2D) -> float:
-        dx = p1[0] - p2[0]
-        dy = p1[1] - p2[1]
-        return (dx * dx + dy * dy) ** 0.5
+    def _snap_filter_dedupe(self, segments: np.ndarray) -> list[Segment2D]:
+        # 吸附、短线过滤与去重在同一个整数网格数组上完成，不生成中间 Python 列表
+        if len(segments) == 0:
+            return []
+        grid = self._snap_to_grid(segments)
+        dx = grid[:, 0, 0] - grid[:, 1, 0]
+        dy = grid[:, 0, 1] - grid[:, 1, 1]
+        # 长度以网格单位比较，平方两边省去开方
+        min_len = self.cfg.min_seg_len_scale
+        kept = np.flatnonzero(dx * dx + dy * dy >= min_len * min_len)
+        if kept.size == 0:
+            return []
+        grid = grid[kept]
+        # 每个端点压成一个 int64 键；按行排序得到与方向无关的规范形式，np.unique 取每组首次出现的位置
+        keys = (grid[:, :, 0] << 32) | (grid[:, :, 1] & 0xFFFFFFFF)
+        keys.sort(axis=1)
+        _, first = np.unique(keys, axis=0, return_index=True)
+        first.sort()
+        return self._grid_to_segments(grid[first])
 
     def _limit_segments(self, segments: list[Segment2D]) -> list[Segment2D]:
         limit = self.cfg.max_debug_segments
@@ -203,31 +248,34 @@ class RobustOutlineExtractor:
         stride = max(1, int(math.ceil(len(segments) / limit)))
         return [segments[idx] for idx in range(0, len(segments), stride)][:limit]
 
-    def _segments_bbox(self, segments: list[Segment2D]) -> tuple[float, float, float, float] | None:
-        if not segments:
+    def _segments_bbox(self, segments: np.ndarray) -> tuple[float, float, float, float] | None:
+        if len(segments) == 0:
             return None
-        xs = []
-        ys = []
-        for p1, p2 in segments:
-            xs.extend((p1[0], p2[0]))
-            ys.extend((p1[1], p2[1]))
-        return (min(xs), min(ys), max(xs), max(ys))
+        points = segments.reshape(-1, 2)
+        (min_x, min_y), (max_x, max_y) = points.min(axis=0).tolist(), points.max(axis=0).tolist()
+        return (min_x, min_y, max_x, max_y)
 
     def _build_offset_vectors(self, raw_segments: list[Segment2D]) -> list[tuple[Point2D, Point2D, float]]:
-        offsets: dict[Point2D, tuple[Point2D, float]] = {}
-        for p1, p2 in raw_segments:
-            for point in (p1, p2):
-                snapped = self._snap_point(point)
-                dist = self._segment_length(point, snapped)
-                current = offsets.get(point)
-                if current is None or dist > current[1]:
-                    offsets[point] = (snapped, dist)
-        vectors = [(raw, snapped, dist) for raw, (snapped, dist) in offsets.items()]
-        vectors.sort(key=lambda item: item[2], reverse=True)
+        # 仅供调试面板使用，生产路径不做这份 O(N) 的工作
+        if not self.cfg.collect_debug_data or not raw_segments:
+            return []
+        # 端点去重（保留首次出现顺序）后整体吸附求偏移，再按偏移距离稳定降序
+        points = np.asarray(raw_segments, dtype=np.float64).reshape(-1, 2)
+        _, first = np.unique(points, axis=0, return_index=True)
+        first.sort()
+        points = points[first]
+        eps = self.cfg.eps_mm
+        snapped = np.rint(points / eps) * eps + 0.0
+        delta = points - snapped
+        dist = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+        order = np.argsort(-dist, kind="stable")
         limit = self.cfg.max_debug_offset_vectors
         if limit >= 0:
-            vectors = vectors[:limit]
-        return vectors
+            order = order[:limit]
+        return [
+            (tuple(raw), tuple(snap), d)
+            for raw, snap, d in zip(points[order].tolist(), snapped[order].tolist(), dist[order].tolist())
+        ]
 
     @staticmethod
     def _polygon_coords(poly: Polygon) -> list[Point2D]:
@@ -237,25 +285,15 @@ class RobustOutlineExtractor:
         return coords
 
     def _build_gap_markers(self, segments: list[Segment2D]) -> list[tuple[Point2D, Point2D, float]]:
-        endpoints: list[Point2D] = []
-        for p1, p2 in segments:
-            endpoints.append(p1)
-            endpoints.append(p2)
-        if len(endpoints) < 2:
+        if not segments:
             return []
-        gaps = []
-        for i, p1 in enumerate(endpoints):
-            min_dist = None
-            closest = None
-            for j, p2 in enumerate(endpoints):
-                if i == j:
-                    continue
-                dist = self._segment_length(p1, p2)
-                if min_dist is None or dist < min_dist:
-                    min_dist = dist
-                    closest = p2
-            if min_dist is not None and closest is not None:
-                gaps.append((p1, closest, min_dist))
+        # 端点直接展平成 (2N, 2) 数组，省去逐个 append 的列表构造
+        endpoints = np.asarray(segments, dtype=np.float64).reshape(-1, 2)
+        nearest_idx, nearest_dist = _nearest_other_endpoints(endpoints)
+        gaps = [
+            (tuple(p1), tuple(p2), dist)
+            for p1, p2, dist in zip(endpoints.tolist(), endpoints[nearest_idx].tolist(), nearest_dist.tolist())
+        ]
         gaps.sort(key=lambda item: item[2], reverse=True)
         limit = self.cfg.max_debug_gap_markers
         if limit >= 0:
@@ -265,65 +303,60 @@ class RobustOutlineExtractor:
     def _bridge_gaps(self, segments: list[Segment2D]) -> tuple[list[Segment2D], list[Segment2D]]:
         if not segments:
             return segments, []
-        endpoints: list[Point2D] = []
-        for p1, p2 in segments:
-            endpoints.append(p1)
-            endpoints.append(p2)
-        if len(endpoints) < 2:
-            return segments, []
-        nearest: list[tuple[int, float]] = []
-        for i, p1 in enumerate(endpoints):
-            best_idx = -1
-            best_dist = None
-            for j, p2 in enumerate(endpoints):
-                if i == j:
-                    continue
-                dist = self._segment_length(p1, p2)
-                if best_dist is None or dist < best_dist:
-                    best_dist = dist
-                    best_idx = j
-            if best_idx >= 0 and best_dist is not None:
-                nearest.append((best_idx, best_dist))
-            else:
-                nearest.append((-1, 0.0))
-        bridged = []
-        used = set()
+        endpoints = np.asarray(segments, dtype=np.float64).reshape(-1, 2)
+        nearest_idx, nearest_dist = _nearest_other_endpoints(endpoints)
+        # 互为最近且距离不超过阈值的端点对一次性向量化求出；互为最近的配对天然不共享端点，
+        # 按 i < j 取一次即与原逐点扫描（含“已用”判定）的结果和顺序一致
+        order = np.arange(len(endpoints))
+        safe_idx = np.where(nearest_idx < 0, order, nearest_idx)
+        mutual = (
+            (nearest_idx > order)
+            & (safe_idx[safe_idx] == order)
+            & (nearest_dist <= self.cfg.gap_bridge_mm)
+            & (nearest_dist[safe_idx] <= self.cfg.gap_bridge_mm)
+        )
+        pairs = np.flatnonzero(mutual)
         max_links = self.cfg.gap_bridge_max_links
-        for i, (j, dist) in enumerate(nearest):
-            if j < 0 or i in used or j in used:
-                continue
-            if dist > self.cfg.gap_bridge_mm:
-                continue
-            back_idx, back_dist = nearest[j]
-            if back_idx != i:
-                continue
-            if back_dist > self.cfg.gap_bridge_mm:
-                continue
-            p1 = endpoints[i]
-            p2 = endpoints[j]
-            key = (p1, p2) if p1 <= p2 else (p2, p1)
-            if key in used:
-                continue
-            bridged.append((p1, p2))
-            used.add(i)
-            used.add(j)
-            if max_links >= 0 and len(bridged) >= max_links:
-                break
+        if max_links >= 0:
+            pairs = pairs[: max(max_links, 1)]
+        bridged = [
+            (tuple(p1), tuple(p2))
+            for p1, p2 in zip(endpoints[pairs].tolist(), endpoints[nearest_idx[pairs]].tolist())
+        ]
         if not bridged:
             return segments, []
         return segments + bridged, bridged
 
     def _polygonize_segments(self, segments: list[Segment2D]) -> tuple[list[Polygon], Dict[str, Any]]:
-        lines = [LineString([p1, p2]) for p1, p2 in segments]
-        if not lines:
+        if not segments:
             return [], {"polygonize_union_type": None, "polygonize_merged_type": None}
-        unioned = unary_union(lines)
+        line_array = _segments_to_lines(segments)
+        lines = shapely.multilinestrings(line_array)
+        # 吸附去重后的线段通常已只在端点相接：is_simple 为真时直接 polygonize_full，
+        # 跳过 union_all 打断与 linemerge，并顺带拿到悬挂边/切割边/无效环的诊断信息；
+        # 否则仍先 union 求交打断，保证 polygonize 输入正确
+        noded = bool(shapely.is_simple(lines))
+        if noded:
+            collections = shapely.polygonize_full(line_array)
+            polygons = list(collections[0].geoms)
+            stats = {
+                "polygonize_union_type": lines.geom_type,
+                "polygonize_merged_type": None,
+                "polygonize_count": len(polygons),
+                "polygonize_skipped_union": True,
+                "polygonize_dangles": len(collections[1].geoms),
+                "polygonize_cuts": len(collections[2].geoms),
+                "polygonize_invalid_rings": len(collections[3].geoms),
+            }
+            return polygons, stats
+        unioned = shapely.union_all(lines)
         merged = linemerge(unioned)
         polygons = [poly for poly in polygonize(merged)]
         stats = {
             "polygonize_union_type": getattr(unioned, "geom_type", None),
             "polygonize_merged_type": getattr(merged, "geom_type", None),
             "polygonize_count": len(polygons),
+            "polygonize_skipped_union": False,
         }
         return polygons, stats
 
@@ -334,10 +367,9 @@ class RobustOutlineExtractor:
         return max(polygons, key=lambda p: p.area)
 
     def _fallback_buffer_polygon(self, segments: list[Segment2D]) -> list[Polygon]:
-        lines = [LineString([p1, p2]) for p1, p2 in segments]
-        if not lines:
+        if not segments:
             return []
-        unioned = unary_union(lines)
+        unioned = shapely.union_all(_segments_to_lines(segments))
         buffered = unioned.buffer(self.cfg.eps_mm * self.cfg.buffer_scale)
         if buffered.is_empty:
             return []
@@ -368,13 +400,13 @@ class OutlineBuilder:
         return self._outline_from_primitives(primitives, units)
 
     def _outline_from_primitives(self, primitives, units: str | None = None):
-        # 优先使用 Region；否则用线段集合闭合为轮廓
-        for prim in primitives:
-            if isinstance(prim, gprim.Region):
-                geom = self._primitive_builder._region_to_shape(prim)
-                if geom is not None and not geom.is_empty:
-                    logger.info("Outline source: region")
-                    return geom
+        # 优先使用 Region；否则用线段集合闭合为轮廓。图元只遍历一次，Region 与线段/圆弧同时分拣
+        regions, edge_prims = self._collect_outline_primitives(primitives)
+        for prim in regions:
+            geom = self._primitive_builder._region_to_shape(prim)
+            if geom is not None and not geom.is_empty:
+                logger.info("Outline source: region")
+                return geom
         if self._config.outline_close_strategy == "robust_polygonize":
             eps = self._tol_in_units(self._config.outline_snap_eps_mm, units)
             arc_err = self._tol_in_units(self._config.outline_arc_max_chord_error_mm, units)
@@ -394,7 +426,7 @@ class OutlineBuilder:
                 return poly
             except Exception as exc:
                 logger.warning("Robust outline failed, falling back to legacy: %s", exc)
-        segments = self._outline_segments_from_primitives(primitives)
+        segments = self._segments_from_edge_primitives(edge_prims)
         if segments:
             # 先尝试按路径顺序闭合，再退回基于图的闭合
             logger.info("Outline segments: %s", len(segments))
@@ -404,9 +436,11 @@ class OutlineBuilder:
                 segments = self._merge_near_colinear_segments(segments, merge_tol)
             merged = unary_union(segments)
             segments = self._merge_outline_segments(segments, merged)
-            loops = self._build_loops_in_order(segments, close_tol)
+            # 坐标只从 GEOS 取一次，两种闭合方式共用
+            segment_coords = _segment_coords(segments)
+            loops = self._build_loops_in_order(segment_coords, close_tol)
             if not loops:
-                loops = self._build_closed_loops(segments, close_tol)
+                loops = self._build_closed_loops(segment_coords, close_tol)
             if loops:
                 polygons = self._loops_to_polygons(loops)
             else:
@@ -417,7 +451,7 @@ class OutlineBuilder:
                     # 旧逻辑：取最大面积多边形作为板框
                     poly = max(polygons, key=lambda p: p.area)
                     if not poly.is_valid:
-                        poly = poly.buffer(0)
+                        poly = _make_valid_polygonal(poly)
                     return poly
                 filled = self._outline_evenodd(polygons)
                 if filled is not None and not filled.is_empty:
@@ -468,16 +502,44 @@ class OutlineBuilder:
             debug["offset_vectors"] = scaled
         return debug
 
-    def _outline_segments_from_primitives(self, primitives):
+    @staticmethod
+    def _collect_outline_primitives(primitives):
+        # 单遍分拣：Region 单独收集，线段/圆弧连同类别按原顺序收集
+        regions = []
+        edge_prims = []
+        for prim in primitives:
+            kind = _primitive_kind(prim)
+            if kind is _PRIM_REGION:
+                regions.append(prim)
+            elif kind is _PRIM_LINE or kind is _PRIM_ARC:
+                edge_prims.append((kind, prim))
+        return regions, edge_prims
+
+    def _segments_from_edge_primitives(self, edge_prims):
         # 仅从线段/圆弧提取轮廓线
         segments = []
-        for prim in primitives:
-            if isinstance(prim, gprim.Line):
-                segments.append(LineString([prim.start, prim.end]))
-            elif isinstance(prim, gprim.Arc):
-                arc_pts = _arc_points(prim, self._config.arc_steps)
-                if len(arc_pts) >= 2:
-                    segments.append(LineString(arc_pts))
+        line_coords = []
+        line_slots = []
+        arcs = []
+        arc_slots = []
+        for kind, prim in edge_prims:
+            if kind is _PRIM_LINE:
+                # 直线先占位，最后用 shapely.linestrings 一次性批量构造
+                line_slots.append(len(segments))
+                line_coords.append((prim.start, prim.end))
+                segments.append(None)
+            elif kind is _PRIM_ARC:
+                # 圆弧同样占位，所有圆弧共享步数，最后一次性批量采样
+                arc_slots.append(len(segments))
+                arcs.append(prim)
+                segments.append(None)
+        if line_coords:
+            for slot, line in zip(line_slots, _segments_to_lines(line_coords)):
+                segments[slot] = line
+        if arcs:
+            arc_lines = shapely.linestrings(_arc_points(arcs, self._config.arc_steps))
+            for slot, line in zip(arc_slots, arc_lines):
+                segments[slot] = line
         return segments
 
     def _merge_near_colinear_segments(self, segments, tol: float):
@@ -487,40 +549,79 @@ class OutlineBuilder:
         lines = [line for line in segments if line is not None and not line.is_empty and len(line.coords) >= 2]
         if len(lines) < 2:
             return lines
-        removed = set()
-        merged_count = 0
+        # 只合并两点直线段：圆弧折线按端点合并会被拉直，保持原样
+        straight = [idx for idx, line in enumerate(lines) if len(line.coords) == 2]
+        if len(straight) < 2:
+            return lines
+        # 方向预筛：方向角（模 180°）按 1° 分桶，可合并的两条线夹角 < 1°，必落在同桶或相邻桶；
+        # 本桶与相邻桶里没有其他线段的直接剔除，全部落单时省掉建树与缓冲区
+        delta = np.diff(shapely.get_coordinates([lines[idx] for idx in straight]).reshape(-1, 2, 2), axis=1)[:, 0]
+        nonzero = (delta != 0).any(axis=1)
+        bins = np.floor(np.degrees(np.arctan2(delta[:, 1], delta[:, 0])) % 180.0).astype(np.intp) % 180
+        counts = np.bincount(bins[nonzero], minlength=180)
+        neighbours = counts + np.roll(counts, 1) + np.roll(counts, -1)
+        eligible = nonzero & (neighbours[bins] >= 2)
+        straight = [idx for idx, ok in zip(straight, eligible.tolist()) if ok]
+        if len(straight) < 2:
+            return lines
         angle_cos = math.cos(math.radians(1.0))
-        changed = True
-        while changed:
-            changed = False
-            active = [line for idx, line in enumerate(lines) if idx not in removed]
-            if len(active) < 2:
-                break
-            tree = STRtree(active)
-            geom_to_idx = {id(line): idx for idx, line in enumerate(lines) if idx not in removed}
-            for idx, line in enumerate(lines):
-                if idx in removed:
-                    continue
-                corridor = line.buffer(tol, cap_style=2, join_style=2)
-                for candidate in tree.query(corridor):
-                    cand_idx = geom_to_idx.get(id(candidate))
-                    if cand_idx is None or cand_idx == idx or cand_idx in removed:
-                        continue
-                    merged = self._try_merge_lines(line, lines[cand_idx], tol, angle_cos)
-                    if merged is None:
-                        continue
-                    lines[idx] = merged
-                    removed.add(cand_idx)
-                    merged_count += 1
-                    changed = True
-                    break
-                if changed:
-                    break
-        merged_lines = [line for idx, line in enumerate(lines) if idx not in removed]
-        if merged_count:
-            logger.info("Outline segments merged near-colinear: %s -> %s", len(segments), len(merged_lines))
+        candidates = [lines[idx] for idx in straight]
+        # 建树一次并批量查询全部候选对，再用并查集单遍合并，避免每次合并后重建 STRtree
+        tree = STRtree(candidates, node_capacity=10)
+        # 查询窗口用外扩 tol 的包围盒即可：它覆盖平头缓冲走廊，精确判定交给后面的向量化校验
+        bounds = shapely.bounds(candidates)
+        windows = shapely.box(bounds[:, 0] - tol, bounds[:, 1] - tol, bounds[:, 2] + tol, bounds[:, 3] + tol)
+        parent = list(range(len(candidates)))
+
+        def find(idx: int) -> int:
+            while parent[idx] != idx:
+                parent[idx] = parent[parent[idx]]
+                idx = parent[idx]
+            return idx
+
+        # Shapely 2 的 query 直接返回输入数组下标；intersects 谓词在树内先剔除仅包围盒相交的候选
+        src_idx, dst_idx = tree.query(windows, predicate="intersects")
+        keep = src_idx != dst_idx
+        src_idx = src_idx[keep]
+        dst_idx = dst_idx[keep]
+        mergeable = self._colinear_merge_mask(np.asarray(candidates, dtype=object), src_idx, dst_idx, tol, angle_cos)
+        for idx, cand_idx in zip(src_idx[mergeable].tolist(), dst_idx[mergeable].tolist()):
+            root_a = find(idx)
+            root_b = find(cand_idx)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        components: Dict[int, list[int]] = {}
+        for idx in range(len(candidates)):
+            components.setdefault(find(idx), []).append(idx)
+        if len(components) == len(candidates):
+            return lines
+        merged_lines = list(lines)
+        removed = set()
+        for root, members in components.items():
+            if len(members) < 2:
+                continue
+            merged_lines[straight[root]] = self._merge_colinear_component(
+                [candidates[idx] for idx in members]
+            )
+            removed.update(straight[idx] for idx in members if idx != root)
+        merged_lines = [line for idx, line in enumerate(merged_lines) if idx not in removed]
+        logger.info("Outline segments merged near-colinear: %s -> %s", len(segments), len(merged_lines))
         return merged_lines
 
+    @staticmethod
+    def _merge_colinear_component(members: list[LineString]) -> LineString:
+        # 以首条线段起点为原点、各线段同向化后的平均方向为轴，取全部端点投影的最小/最大值
+        coords = np.array([line.coords for line in members], dtype=np.float64)
+        dirs = coords[:, 1] - coords[:, 0]
+        dirs /= np.hypot(dirs[:, 0], dirs[:, 1])[:, None]
+        dirs[dirs @ dirs[0] < 0] *= -1.0
+        axis = dirs.sum(axis=0)
+        axis /= np.hypot(axis[0], axis[1])
+        origin = coords[0, 0]
+        t = (coords.reshape(-1, 2) - origin) @ axis
+        return LineString([origin + axis * t.min(), origin + axis * t.max()])
+
     def _tol_in_units(self, tol_mm: float, units: str | None) -> float:
         if tol_mm <= 0:
             return 0.0
@@ -528,107 +629,92 @@ class OutlineBuilder:
             return tol_mm / 25.4
         return tol_mm
 
-    def _try_merge_lines(self, line_a: LineString, line_b: LineString, tol: float, angle_cos: float):
-        if line_a is None or line_b is None:
-            return None
-        coords_a = list(line_a.coords)
-        coords_b = list(line_b.coords)
-        if len(coords_a) < 2 or len(coords_b) < 2:
-            return None
-        ax0, ay0 = coords_a[0]
-        ax1, ay1 = coords_a[-1]
-        bx0, by0 = coords_b[0]
-        bx1, by1 = coords_b[-1]
-        dax = ax1 - ax0
-        day = ay1 - ay0
-        dbx = bx1 - bx0
-        dby = by1 - by0
-        len_a = (dax * dax + day * day) ** 0.5
-        len_b = (dbx * dbx + dby * dby) ** 0.5
-        if len_a == 0 or len_b == 0:
-            return None
-        dir_a = (dax / len_a, day / len_a)
-        dir_b = (dbx / len_b, dby / len_b)
-        dot = abs(dir_a[0] * dir_b[0] + dir_a[1] * dir_b[1])
-        if dot < angle_cos:
-            return None
-        if line_a.distance(Point(coords_b[0])) > tol or line_a.distance(Point(coords_b[-1])) > tol:
-            return None
-
-        def proj(point) -> float:
-            return (point[0] - ax0) * dir_a[0] + (point[1] - ay0) * dir_a[1]
-
-        t_a0 = proj(coords_a[0])
-        t_a1 = proj(coords_a[-1])
-        t_b0 = proj(coords_b[0])
-        t_b1 = proj(coords_b[-1])
-        a_min = min(t_a0, t_a1)
-        a_max = max(t_a0, t_a1)
-        b_min = min(t_b0, t_b1)
-        b_max = max(t_b0, t_b1)
-        if a_max < b_min:
-            gap = b_min - a_max
-        elif b_max < a_min:
-            gap = a_min - b_max
-        else:
-            gap = 0.0
-        if gap > tol:
-            return None
-        t_min = min(a_min, b_min)
-        t_max = max(a_max, b_max)
-        start = (ax0 + dir_a[0] * t_min, ay0 + dir_a[1] * t_min)
-        end = (ax0 + dir_a[0] * t_max, ay0 + dir_a[1] * t_max)
-        if self._points_close(start, end, tol):
-            return None
-        return LineString([start, end])
+    @staticmethod
+    def _colinear_merge_mask(
+        lines: np.ndarray,
+        src_idx: np.ndarray,
+        dst_idx: np.ndarray,
+        tol: float,
+        angle_cos: float,
+    ) -> np.ndarray:
+        """对全部候选对 (a, b) 向量化判断两点线段 b 能否并入 a。"""
+        # 条件：方向夹角 < 1°、b 两端点到 a 的距离都不超过 tol、沿 a 方向的投影区间间隙不超过 tol，
+        # 且合并后线段长度超过 tol；整批候选一次算完，不再逐对进入解释器
+        coords = shapely.get_coordinates(lines).reshape(-1, 2, 2)
+        a0 = coords[src_idx, 0]
+        a1 = coords[src_idx, 1]
+        b0 = coords[dst_idx, 0]
+        b1 = coords[dst_idx, 1]
+        delta_a = a1 - a0
+        delta_b = b1 - b0
+        len_a = np.sqrt(delta_a[:, 0] * delta_a[:, 0] + delta_a[:, 1] * delta_a[:, 1])
+        len_b = np.sqrt(delta_b[:, 0] * delta_b[:, 0] + delta_b[:, 1] * delta_b[:, 1])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dir_a = delta_a / len_a[:, None]
+            dir_b = delta_b / len_b[:, None]
+        dot = np.abs(dir_a[:, 0] * dir_b[:, 0] + dir_a[:, 1] * dir_b[:, 1])
+        ok = (len_a != 0) & (len_b != 0) & (dot >= angle_cos)
+        if not ok.any():
+            return ok
+        line_a = lines[src_idx]
+        ok &= shapely.distance(line_a, shapely.points(b0)) <= tol
+        ok &= shapely.distance(line_a, shapely.points(b1)) <= tol
+
+        def proj(point: np.ndarray) -> np.ndarray:
+            return (point[:, 0] - a0[:, 0]) * dir_a[:, 0] + (point[:, 1] - a0[:, 1]) * dir_a[:, 1]
+
+        t_a0 = proj(a0)
+        t_a1 = proj(a1)
+        t_b0 = proj(b0)
+        t_b1 = proj(b1)
+        a_min = np.minimum(t_a0, t_a1)
+        a_max = np.maximum(t_a0, t_a1)
+        b_min = np.minimum(t_b0, t_b1)
+        b_max = np.maximum(t_b0, t_b1)
+        gap = np.where(a_max < b_min, b_min - a_max, np.where(b_max < a_min, a_min - b_max, 0.0))
+        ok &= gap <= tol
+        t_min = np.minimum(a_min, b_min)
+        t_max = np.maximum(a_max, b_max)
+        dx = (a0[:, 0] + dir_a[:, 0] * t_min) - (a0[:, 0] + dir_a[:, 0] * t_max)
+        dy = (a0[:, 1] + dir_a[:, 1] * t_min) - (a0[:, 1] + dir_a[:, 1] * t_max)
+        ok &= dx * dx + dy * dy > tol * tol
+        return ok
 
     def _merge_outline_segments(self, segments, merged):
         # 合并重叠/共线线段，减少重复以利于闭合。
         if merged is None:
             return segments
-        merged_segments = []
-
-        def _collect_lines(geom):
-            if geom is None or geom.is_empty:
-                return
-            if isinstance(geom, LineString):
-                if len(geom.coords) >= 2:
-                    merged_segments.append(geom)
-                return
-            if isinstance(geom, MultiLineString):
-                for line in geom.geoms:
-                    _collect_lines(line)
-                return
-            for child in getattr(geom, "geoms", []):
-                _collect_lines(child)
-
-        _collect_lines(merged)
+        # union 结果最多两层嵌套（GeometryCollection -> MultiLineString），两次 get_parts 在 C 层摊平
+        parts = shapely.get_parts(shapely.get_parts(merged))
+        keep = (shapely.get_type_id(parts) == shapely.GeometryType.LINESTRING) & (shapely.get_num_coordinates(parts) >= 2)
+        merged_segments = parts[keep].tolist()
         if merged_segments:
             logger.info("Outline segments merged: %s -> %s", len(segments), len(merged_segments))
             return merged_segments
         return segments
 
-    def _build_loops_in_order(self, segments, tol: float):
-        # 按原始顺序拼接，若端点接近则延续
+    def _build_loops_in_order(self, segment_coords, tol: float):
+        # 按原始顺序拼接，若端点接近则延续；segment_coords 为 _segment_coords 取出的逐段坐标
         loops = []
         current = []
         start_point = None
-        for seg in segments:
-            coords = list(seg.coords)
+        for coords in segment_coords:
             if len(coords) < 2:
                 continue
             if not current:
-                current = coords[:]
+                # 坐标列表与图闭合共用，路径会被原地延长，所以这里复制一份
+                current = list(coords)
                 start_point = current[0]
                 continue
             last = current[-1]
             if self._points_close(last, coords[0], tol):
-                current.extend(coords[1:])
+                current.extend(itertools.islice(coords, 1, None))
             elif self._points_close(last, coords[-1], tol):
-                current.extend(list(reversed(coords))[:-1])
+                # 反向接续：跳过与 last 重合的末点，从倒数第二点一路取到首点；用迭代器避免中间列表
+                current.extend(itertools.islice(reversed(coords), 1, None))
             else:
                 loops.extend(self._finalize_path_loop(current, start_point, tol))
-                current = coords[:]
+                current = list(coords)
                 start_point = current[0]
         if current:
             loops.extend(self._finalize_path_loop(current, start_point, tol))
@@ -647,63 +733,59 @@ class OutlineBuilder:
                 return [LineString(path)]
         return []
 
-    def _build_closed_loops(self, segments, tol: float):
-        # 构建端点邻接图，尝试遍历成闭合环
-        edges = []
+    def _build_closed_loops(self, segment_coords, tol: float):
+        # 构建端点邻接图，尝试遍历成闭合环；边按列存成平行列表（坐标/起点/终点/两端方向/已用标记）
+        edge_coords = []
+        edge_start = []
+        edge_end = []
+        # 两端方向在建边时一次算好，遍历中只读
+        dir_start = []
+        dir_end = []
         adjacency = {}
-        nodes = []
+        _node_for = _EndpointClusterer(tol).add
 
-        def _node_for(point):
-            return self._cluster_point(nodes, point, tol)
-
-        for line in segments:
-            coords = list(line.coords)
+        for coords in segment_coords:
             if len(coords) < 2:
                 continue
             start_node = _node_for(coords[0])
             end_node = _node_for(coords[-1])
-            edge = {
-                "coords": coords,
-                "start": start_node,
-                "end": end_node,
-                "used": False,
-            }
-            idx = len(edges)
-            edges.append(edge)
+            idx = len(edge_coords)
+            edge_coords.append(coords)
+            edge_start.append(start_node)
+            edge_end.append(end_node)
+            dir_start.append(self._edge_dir(coords, True))
+            dir_end.append(self._edge_dir(coords, False))
             adjacency.setdefault(start_node, []).append(idx)
             adjacency.setdefault(end_node, []).append(idx)
+        edge_count = len(edge_coords)
+        used = bytearray(edge_count)
         loops = []
-        for edge in edges:
-            if edge["used"]:
+        for idx in range(edge_count):
+            if used[idx]:
                 continue
-            start = edge["start"]
-            edge["used"] = True
-            path = list(edge["coords"])
-            current = edge["end"]
-            prev_dir = self._edge_dir(edge, start)
-            steps = 0
+            start = edge_start[idx]
+            used[idx] = 1
+            path = list(edge_coords[idx])
+            current = edge_end[idx]
+            prev_dir = dir_start[idx]
+            # 每走一步都会消耗一条未用边，遍历步数天然不超过边数，无需额外的步数上限
             while True:
                 if current == start:
                     break
-                next_idx = self._pick_next_edge(edges, adjacency, current, prev_dir)
+                next_idx = self._pick_next_edge(edge_start, dir_start, dir_end, used, adjacency, current, prev_dir)
                 if next_idx is None:
                     path = []
                     break
-                next_edge = edges[next_idx]
-                next_edge["used"] = True
-                if current == next_edge["start"]:
-                    coords = next_edge["coords"]
-                    current = next_edge["end"]
-                    prev_dir = self._edge_dir(next_edge, next_edge["start"])
+                used[next_idx] = 1
+                if current == edge_start[next_idx]:
+                    coords = edge_coords[next_idx]
+                    current = edge_end[next_idx]
+                    prev_dir = dir_start[next_idx]
                 else:
-                    coords = list(reversed(next_edge["coords"]))
-                    current = next_edge["start"]
-                    prev_dir = self._edge_dir(next_edge, next_edge["end"])
+                    coords = list(reversed(edge_coords[next_idx]))
+                    current = edge_start[next_idx]
+                    prev_dir = dir_end[next_idx]
                 path.extend(coords[1:])
-                steps += 1
-                if steps > len(edges):
-                    path = []
-                    break
             if path:
                 if path[0] != path[-1]:
                     path.append(path[0])
@@ -712,31 +794,12 @@ class OutlineBuilder:
         logger.info("Outline loops built: %s", len(loops))
         return loops
 
-    def _cluster_point(self, nodes, point, tol: float):
-        # 端点吸附：将近邻点聚成同一节点
-        px, py = float(point[0]), float(point[1])
-        if tol <= 0:
-            nodes.append((px, py))
-            return len(nodes) - 1
-        best = None
-        for idx, (nx, ny) in enumerate(nodes):
-            dx = px - nx
-            dy = py - ny
-            if (dx * dx + dy * dy) ** 0.5 <= tol:
-                best = idx
-                break
-        if best is None:
-            nodes.append((px, py))
-            return len(nodes) - 1
-        nx, ny = nodes[best]
-        nodes[best] = ((nx + px) / 2.0, (ny + py) / 2.0)
-        return best
-
-    def _edge_dir(self, edge, node_idx):
-        coords = edge["coords"]
+    @staticmethod
+    def _edge_dir(coords, at_start: bool):
+        # 边在起点（或终点）处指向边内部的单位方向
         if len(coords) < 2:
             return (0.0, 0.0)
-        if node_idx == edge["start"]:
+        if at_start:
             p1 = coords[0]
             p2 = coords[1]
         else:
@@ -744,55 +807,49 @@ class OutlineBuilder:
             p2 = coords[-2]
         dx = p2[0] - p1[0]
         dy = p2[1] - p1[1]
-        length = (dx * dx + dy * dy) ** 0.5
+        length = math.hypot(dx, dy)
         if length == 0:
             return (0.0, 0.0)
         return (dx / length, dy / length)
 
-    def _pick_next_edge(self, edges, adjacency, node_idx, prev_dir):
-        # 选择与当前方向夹角最小的边，减少交叉
-        candidates = []
-        for candidate in adjacency.get(node_idx, []):
-            if edges[candidate]["used"]:
-                continue
-            edge = edges[candidate]
-            if node_idx == edge["start"]:
-                direction = self._edge_dir(edge, edge["start"])
-            else:
-                direction = self._edge_dir(edge, edge["end"])
-            candidates.append((candidate, direction))
-        if not candidates:
-            return None
-        if prev_dir == (0.0, 0.0):
-            return candidates[0][0]
+    @staticmethod
+    def _pick_next_edge(edge_start, dir_start, dir_end, used, adjacency, node_idx, prev_dir):
+        # 选择与当前方向夹角最小的边，减少交叉；单遍扫描，夹角相同时保留先出现者
+        has_prev = prev_dir != (0.0, 0.0)
         best = None
         best_angle = None
-        for idx, direction in candidates:
-            dot = prev_dir[0] * direction[0] + prev_dir[1] * direction[1]
-            angle = 1.0 - dot
+        for candidate in adjacency.get(node_idx, ()):
+            if used[candidate]:
+                continue
+            if not has_prev:
+                return candidate
+            direction = dir_start[candidate] if node_idx == edge_start[candidate] else dir_end[candidate]
+            angle = 1.0 - (prev_dir[0] * direction[0] + prev_dir[1] * direction[1])
             if best is None or angle < best_angle:
-                best = idx
+                best = candidate
                 best_angle = angle
         return best
 
     def _points_close(self, p1, p2, tol: float) -> bool:
         dx = p1[0] - p2[0]
         dy = p1[1] - p2[1]
-        dist = (dx * dx + dy * dy) ** 0.5
+        dist_sq = dx * dx + dy * dy
         if tol <= 0:
-            return dist == 0
-        return dist <= tol
+            return dist_sq == 0
+        return dist_sq <= tol * tol
 
 
     def _loops_to_polygons(self, loops):
+        # 环坐标一次性取成数组并按下标批量建环/建多边形，不再逐环物化 Python 坐标列表
+        loops = np.asarray(loops, dtype=object)
+        loops = loops[shapely.get_num_coordinates(loops) >= 4]
+        if len(loops) == 0:
+            return []
+        coords, ring_idx = shapely.get_coordinates(loops, return_index=True)
         polygons = []
-        for loop in loops:
-            coords = list(loop.coords)
-            if len(coords) < 4:
-                continue
-            poly = Polygon(coords)
+        for poly in shapely.polygons(shapely.linearrings(coords, indices=ring_idx)).tolist():
             if not poly.is_valid:
-                poly = poly.buffer(0)
+                poly = _make_valid_polygonal(poly)
             if not poly.is_empty and poly.area > 0:
                 polygons.append(poly)
         return polygons
@@ -804,20 +861,30 @@ class OutlineBuilder:
             if poly is None or poly.is_empty:
                 continue
             if not poly.is_valid:
-                poly = poly.buffer(0)
+                poly = _make_valid_polygonal(poly)
             if poly.is_empty:
                 continue
             cleaned.append(poly)
         if not cleaned:
             return None
         cleaned.sort(key=lambda p: p.area, reverse=True)
-        parents = [-1] * len(cleaned)
-        for i, poly in enumerate(cleaned):
-            point = poly.representative_point()
-            for j in range(i):
-                if cleaned[j].contains(point):
-                    parents[i] = j
-                    break
+        count = len(cleaned)
+        parent_idx = np.full(count, -1, dtype=np.intp)
+        # 父多边形判定会对同一多边形反复做点包含测试：先 prepare 建边界索引，代表点坐标一次性批量求出
+        shapely.prepare(cleaned)
+        rep_xy = shapely.get_coordinates(shapely.point_on_surface(cleaned))
+        xs = rep_xy[:, 0]
+        ys = rep_xy[:, 1]
+        bboxes = shapely.bounds(cleaned)
+        # 以父为主序：按面积从大到小逐个多边形认领其后尚无父节点、代表点落在其内的多边形；
+        # 包围盒预筛与 contains_xy 都对整批候选点一次调用。先认领者即编号最小的包含者，与逐子扫描结果一致
+        for j in range(count - 1):
+            cand = np.flatnonzero(parent_idx[j + 1 :] == -1) + (j + 1)
+            min_x, min_y, max_x, max_y = bboxes[j]
+            cand = cand[(xs[cand] >= min_x) & (xs[cand] <= max_x) & (ys[cand] >= min_y) & (ys[cand] <= max_y)]
+            if cand.size:
+                parent_idx[cand[shapely.contains_xy(cleaned[j], xs[cand], ys[cand])]] = j
+        parents = parent_idx.tolist()
         depths = [0] * len(cleaned)
         for i in range(len(cleaned)):
             depth = 0
@@ -828,29 +895,162 @@ class OutlineBuilder:
             depths[i] = depth
         even_polys = [poly for poly, depth in zip(cleaned, depths) if depth % 2 == 0]
         odd_polys = [poly for poly, depth in zip(cleaned, depths) if depth % 2 == 1]
-        result = unary_union(even_polys) if even_polys else None
+        result = _union_polygons(even_polys) if even_polys else None
         if result is None:
             return None
         if odd_polys:
-            result = result.difference(unary_union(odd_polys))
+            result = result.difference(_union_polygons(odd_polys))
         return result
 
 
-def _arc_points(arc: gprim.Arc, steps: int):
-    # 与 primitives 中类似的圆弧采样
+def _make_valid_polygonal(poly):
+    # 用 GEOS 专门的 make_valid 代替 buffer(0) 修复自交；structure 方法只输出面，自交环的各个瓣都会保留
+    return shapely.make_valid(poly, method="structure", keep_collapsed=False)
+
+
+# shapely 2.1 起提供该函数，但底层还要求 GEOS >= 3.12
+_disjoint_subset_union_all = (
+    getattr(shapely, "disjoint_subset_union_all", None) if shapely.geos_version >= (3, 12, 0) else None
+)
+
+
+def _union_polygons(polys: list[Polygon]):
+    # 同一深度层的板框通常互不相交：此时走 coverage_union_all 快速路径。
+    # coverage union 对重叠输入不会报错而是静默给出错误结果，所以先用 STRtree 确认两两不相交
+    if len(polys) > 1:
+        src_idx, dst_idx = STRtree(polys).query(polys, predicate="intersects")
+        if np.array_equal(src_idx, dst_idx):
+            return shapely.coverage_union_all(polys)
+        # 有重叠时 GEOS 3.12+ 的 disjoint_subset_union 先按连通子集拆分再各自合并，
+        # 比整体 overlay 快得多；旧版 shapely/GEOS 没有该函数时退回 unary_union
+        if _disjoint_subset_union_all is not None:
+            return _disjoint_subset_union_all(polys)
+    return unary_union(polys)
+
+
+class _EndpointClusterer:
+    """端点吸附：将容差内的近邻点聚成同一节点。"""
+
+    __slots__ = ("_tol", "_nodes", "_grid")
+
+    def __init__(self, tol: float) -> None:
+        self._tol = tol
+        self._nodes: list[Point2D] = []
+        # 以 tol 为边长分桶：容差内的点必落在相邻 3x3 个格子里，查找不再线性扫描全部节点
+        self._grid: dict[tuple[int, int], list[int]] = {}
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return (math.floor(x / self._tol), math.floor(y / self._tol))
+
+    def add(self, point) -> int:
+        px, py = float(point[0]), float(point[1])
+        nodes = self._nodes
+        if self._tol <= 0:
+            nodes.append((px, py))
+            return len(nodes) - 1
+        tol_sq = self._tol * self._tol
+        cx, cy = self._cell(px, py)
+        best = None
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for idx in self._grid.get((gx, gy), ()):
+                    if best is not None and idx >= best:
+                        continue
+                    nx, ny = nodes[idx]
+                    dx = px - nx
+                    dy = py - ny
+                    if dx * dx + dy * dy <= tol_sq:
+                        best = idx
+        if best is None:
+            nodes.append((px, py))
+            self._grid.setdefault((cx, cy), []).append(len(nodes) - 1)
+            return len(nodes) - 1
+        # 与原线性扫描一致取编号最小的命中节点，并移到中点；跨格时同步搬桶
+        nx, ny = nodes[best]
+        merged = ((nx + px) / 2.0, (ny + py) / 2.0)
+        nodes[best] = merged
+        old_cell = self._cell(nx, ny)
+        new_cell = self._cell(*merged)
+        if new_cell != old_cell:
+            self._grid[old_cell].remove(best)
+            self._grid.setdefault(new_cell, []).append(best)
+        return best
+
+
+def _segment_tuples(segments: np.ndarray) -> list[Segment2D]:
+    return [((x1, y1), (x2, y2)) for (x1, y1), (x2, y2) in segments.tolist()]
+
+
+def _segment_coords(segments) -> list[list[Point2D]]:
+    # 一次 get_coordinates 取出全部线段坐标，再按线段切分成元组列表，避免逐段 list(line.coords)
+    coords, line_idx = shapely.get_coordinates(segments, return_index=True)
+    points = list(map(tuple, coords.tolist()))
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(line_idx, minlength=len(segments))))).tolist()
+    return [points[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def _segments_to_lines(segments: list[Segment2D]) -> np.ndarray:
+    # shapely 2 批量构造：一次调用从 (N, 2, 2) 坐标数组生成全部两点 LineString
+    return shapely.linestrings(np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2))
+
+
+def _nearest_other_endpoints(endpoints: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """返回每个端点最近的其他端点下标与距离；等距时取下标最小者（与逐对扫描一致）。"""
+    points = np.asarray(endpoints, dtype=np.float64).reshape(-1, 2)
+    count = len(points)
+    unique, inverse, counts = np.unique(points, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    # 按位置分组后组内下标升序：每组首个/次个下标即重合端点的最近候选
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    first = order[starts]
+    second = order[np.minimum(starts + 1, count - 1)]
+    nearest = np.full(count, -1, dtype=np.intp)
+    dist = np.zeros(count, dtype=np.float64)
+    # 重合端点：距离为 0，取同位置的其他最小下标
+    dup = counts[inverse] > 1
+    dup_group = inverse[dup]
+    is_first = first[dup_group] == np.flatnonzero(dup)
+    nearest[dup] = np.where(is_first, second[dup_group], first[dup_group])
+    # 孤立端点：用 STRtree 在其余位置中找最近者（O(N log N)，替代两两扫描）
+    single = np.flatnonzero(~dup)
+    if len(single) and len(unique) > 1:
+        tree = STRtree(shapely.points(unique))
+        (query_pos, tree_idx), _ = tree.query_nearest(
+            shapely.points(unique[inverse[single]]),
+            exclusive=True,
+            all_matches=True,
+            return_distance=True,
+        )
+        best = np.full(len(single), np.iinfo(np.intp).max, dtype=np.intp)
+        np.minimum.at(best, query_pos, first[tree_idx])
+        nearest[single] = best
+        delta = points[single] - points[best]
+        dist[single] = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+    return nearest, dist
+
+
+@functools.lru_cache(maxsize=256)
+def _arc_max_step(radius: float, chord_err: float) -> float:
+    # 板上大量圆弧共用同一半径（圆角、邮票孔等），按 (半径, 弦高误差) 缓存最大步进角
+    return 2 * math.acos(max(0.0, 1.0 - chord_err / radius))
+
+
+def _arc_points(arcs: list[gprim.Arc], steps: int) -> np.ndarray:
+    # 与 primitives 中类似的圆弧采样；所有圆弧步数相同，按列存成数组后一次算出 (N, steps, 2) 采样点
     steps = max(8, steps)
-    start = arc.start_angle
-    end = arc.end_angle
-    if arc.direction == "counterclockwise":
-        if end <= start:
-            end += 2 * math.pi
-        angles = [start + (end - start) * i / (steps - 1) for i in range(steps)]
-    else:
-        if end >= start:
-            end -= 2 * math.pi
-        angles = [start + (end - start) * i / (steps - 1) for i in range(steps)]
-    cx, cy = arc.center
-    return [(cx + arc.radius * math.cos(a), cy + arc.radius * math.sin(a)) for a in angles]
+    start = np.array([arc.start_angle for arc in arcs], dtype=np.float64)
+    end = np.array([arc.end_angle for arc in arcs], dtype=np.float64)
+    ccw = np.array([arc.direction == "counterclockwise" for arc in arcs], dtype=bool)
+    end = np.where(ccw & (end <= start), end + 2 * math.pi, end)
+    end = np.where(~ccw & (end >= start), end - 2 * math.pi, end)
+    centers = np.array([arc.center for arc in arcs], dtype=np.float64)
+    radius = np.array([arc.radius for arc in arcs], dtype=np.float64)[:, None]
+    # 运算顺序与逐点公式 start + (end - start) * i / (steps - 1) 相同
+    angles = start[:, None] + (end - start)[:, None] * np.arange(steps, dtype=np.float64) / (steps - 1)
+    xs = centers[:, 0:1] + radius * np.cos(angles)
+    ys = centers[:, 1:2] + radius * np.sin(angles)
+    return np.stack((xs, ys), axis=-1)
 
 
 def _cli() -> int:
@@ -277,7 +277,10 @@ def _format_poly_stats(debug: dict) -> str:
     poly_count = debug.get("polygonize_count")
     if union_type is None and merged_type is None:
         return ""
-    return f" | poly={poly_count} union={union_type} merge={merged_type}"
+    text = f" | poly={poly_count} union={union_type} merge={merged_type}"
+    if debug.get("polygonize_dangles") is not None:
+        text += f" dangles={debug.get('polygonize_dangles')} cuts={debug.get('polygonize_cuts')}"
+    return text
 
 
 def _percentile(values: list[float], percent: float) -> float:
@@ -334,10 +334,11 @@ def _clean_ring(coords, min_edge: float, quantize: float):
     if not points:
         return None
     cleaned = [points[0]]
+    min_edge_sq = min_edge * min_edge if min_edge and min_edge > 0 else 0.0
     for point in points[1:]:
         dx = point[0] - cleaned[-1][0]
         dy = point[1] - cleaned[-1][1]
-        if min_edge and min_edge > 0 and (dx * dx + dy * dy) ** 0.5 < min_edge:
+        if dx * dx + dy * dy < min_edge_sq:
             continue
         cleaned.append(point)
     if len(cleaned) < 3:
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-from fnmatch import fnmatch
 from pathlib import Path
 import logging
 import time
+from typing import Callable
 
 from shapely.geometry import box
 from shapely.ops import unary_union
 
-from ..config import StencilConfig
+from ..config import StencilConfig, compile_name_patterns, name_matches
 from ..geometry import GerberGeometryService
 from .engine import EngineExportInput, get_model_engine
 from .geometry import count_holes
@@ -46,6 +46,9 @@ _OUTLINE_FALLBACK_PATTERNS = [
     "*edgecuts*",
 ]
 
+_PASTE_FALLBACK_RE = compile_name_patterns(_PASTE_FALLBACK_PATTERNS)
+_OUTLINE_FALLBACK_RE = compile_name_patterns(_OUTLINE_FALLBACK_PATTERNS)
+
 
 def generate_stencil(input_dir: Path, output_path: Path, config: StencilConfig) -> dict | None:
     if not logging.getLogger().handlers:
@@ -57,9 +60,9 @@ def generate_stencil(input_dir: Path, output_path: Path, config: StencilConfig)
     logger.info("Output STL: %s", output_path)
     overall_start = time.perf_counter()
 
-    paste_files = _find_files(input_dir, config.paste_patterns)
+    paste_files = _find_files(input_dir, config.match_paste)
     if not paste_files:
-        paste_files = _find_files(input_dir, _PASTE_FALLBACK_PATTERNS)
+        paste_files = _find_files(input_dir, _match_paste_fallback)
         if paste_files:
             logger.warning(
                 "Paste layer fallback matched %s file(s) using builtin patterns.",
@@ -95,9 +98,9 @@ def generate_stencil(input_dir: Path, output_path: Path, config: StencilConfig)
     outline_geom = None
     outline_debug: dict | None = None
     logger.info("Outline patterns: %s", ", ".join(config.outline_patterns) if config.outline_patterns else "(none)")
-    outline_files = _find_files(input_dir, config.outline_patterns)
+    outline_files = _find_files(input_dir, config.match_outline)
     if not outline_files:
-        outline_files = _find_files(input_dir, _OUTLINE_FALLBACK_PATTERNS)
+        outline_files = _find_files(input_dir, _match_outline_fallback)
         if outline_files:
             logger.warning(
                 "Outline fallback matched %s file(s) using builtin patterns.",
@@ -254,23 +257,22 @@ def generate_stencil(input_dir: Path, output_path: Path, config: StencilConfig)
     return outline_debug
 
 
-def _find_files(input_dir: Path, patterns: list[str]) -> list[Path]:
-    if not patterns:
-        return []
+def _find_files(input_dir: Path, matcher: Callable[[str], bool]) -> list[Path]:
     files = []
     for path in input_dir.rglob("*"):
         if not path.is_file():
             continue
-        name = path.name.lower()
-        for pattern in patterns:
-            if _match(pattern.lower(), name):
-                files.append(path)
-                break
+        if matcher(path.name):
+            files.append(path)
     return sorted(set(files))
 
 
-def _match(pattern: str, name: str) -> bool:
-    return fnmatch(name, pattern)
+def _match_paste_fallback(name: str) -> bool:
+    return name_matches(_PASTE_FALLBACK_RE, name)
+
+
+def _match_outline_fallback(name: str) -> bool:
+    return name_matches(_OUTLINE_FALLBACK_RE, name)
 
 
 def _outline_from_paste(paste_geom, margin_mm: float):
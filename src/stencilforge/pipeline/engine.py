@@ -18,8 +18,10 @@ from .mesh import cleanup_mesh, translate_to_origin
 
 logger = logging.getLogger(__name__)
 
+_WATERTIGHT_MODES = frozenset({"auto", "watertight"})
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class EngineExportInput:
     stencil_2d: object
     locator_geom: object
@@ -168,7 +170,7 @@ class SfMeshEngine:
                 time.perf_counter() - t0,
                 pitch_mm,
             )
-        elif cfg.sfmesh_quality_mode in {"auto", "watertight"}:
+        elif cfg.sfmesh_quality_mode in _WATERTIGHT_MODES:
             logger.info(
                 "sfmesh watertight skipped: mode=%s faces=%s limit=%s watertight=%s",
                 cfg.sfmesh_quality_mode,
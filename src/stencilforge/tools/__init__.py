@@ -0,0 +1 @@
+"""开发与回归工具。"""
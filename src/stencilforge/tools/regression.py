@@ -0,0 +1,593 @@
+from __future__ import annotations
+
+"""sfmesh 回归：批量跑夹具 ZIP，统计网格指标并与基线比较。"""
+
+import argparse
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+import functools
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import traceback
+import uuid
+import zipfile
+
+import numpy as np
+import trimesh
+
+try:
+    import blake3
+except ImportError:  # 可选依赖：缺失时 ZIP 摘要回退到 hashlib.sha256
+    blake3 = None
+
+try:
+    import orjson
+except ImportError:  # 可选依赖：缺失时回退到标准库 json
+    orjson = None
+
+from ..config import StencilConfig
+from ..pipeline import generate_stencil
+from ..pipeline.core import _match_outline_fallback, _match_paste_fallback
+
+_ZIP_READ_BUFFER = 1 << 20
+_ERROR_TEXT_LIMIT = 2000
+_TRACE_FRAME_LIMIT = 5
+# 摘要算法写入缓存键，两种环境生成的缓存互不误命中
+_ZIP_DIGEST_ALGO = b"blake3" if blake3 is not None else b"sha256"
+
+
+def _worker_init() -> None:
+    # 在进程池启动时预热重型依赖，避免首个任务承担导入开销
+    import shapely.geometry  # noqa: F401
+    import trimesh  # noqa: F401
+
+    from ..pipeline import engine  # noqa: F401
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    if sys.platform == "win32":
+        return multiprocessing.get_context("spawn")
+    return multiprocessing.get_context("forkserver")
+
+
+def _default_config(quality_mode: str, voxel_pitch_mm: float) -> StencilConfig:
+    return StencilConfig.from_dict(
+        {
+            "model_backend": "sfmesh",
+            "sfmesh_quality_mode": quality_mode,
+            "sfmesh_voxel_pitch_mm": voxel_pitch_mm,
+            "paste_patterns": [
+                "*gtp*",
+                "*.gtp",
+                "*gbp*",
+                "*.gbp",
+                "*paste*top*",
+                "*top*paste*",
+                "*paste*bottom*",
+                "*bottom*paste*",
+                "*tcream*",
+                "*cream*top*",
+                "*smt*top*",
+            ],
+            "outline_patterns": ["*gko*", "*gm1*", "*outline*", "*edge*cuts*"],
+            "outline_fill_rule": "evenodd",
+            "outline_close_strategy": "robust_polygonize",
+            "outline_merge_tol_mm": 0.01,
+            "outline_snap_eps_mm": 0.05,
+            "outline_gap_bridge_mm": 0.1,
+            "sfmesh_adaptive_pitch_enabled": True,
+            "sfmesh_adaptive_pitch_min_mm": voxel_pitch_mm,
+            "sfmesh_adaptive_pitch_max_mm": max(voxel_pitch_mm, 0.24),
+            "sfmesh_watertight_face_limit": 250000,
+        }
+    )
+
+
+def _collect_metrics(stl_path: Path) -> dict:
+    stat = stl_path.stat()
+    return dict(_collect_metrics_cached(str(stl_path), stat.st_mtime_ns, stat.st_size))
+
+
+@functools.lru_cache(maxsize=512)
+def _collect_metrics_cached(stl_path: str, mtime_ns: int, size: int) -> dict:
+    mesh = trimesh.load_mesh(stl_path, force="mesh")
+    bounds = mesh.bounds.tolist() if mesh.bounds is not None else None
+    return {
+        "faces": int(mesh.faces.shape[0]) if getattr(mesh, "faces", None) is not None else 0,
+        "watertight": bool(getattr(mesh, "is_watertight", False)),
+        "euler": int(getattr(mesh, "euler_number", 0)),
+        "volume": float(getattr(mesh, "volume", 0.0)),
+        "bounds": bounds,
+    }
+
+
+@dataclass(frozen=True)
+class _ExpectIndex:
+    # 以列式数组保存基线，整批样本的比较只需几次向量运算
+    rows: dict[str, int]
+    items: list[dict]
+    faces: np.ndarray
+    tol_faces: np.ndarray
+    volume: np.ndarray
+    tol_volume: np.ndarray
+    bounds: np.ndarray
+    has_bounds: np.ndarray
+    tol_bounds: np.ndarray
+
+
+def _load_expect(path: Path) -> _ExpectIndex:
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return _build_expect_index({})
+    return _load_expect_cached(str(path.resolve()), mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_expect_cached(path: str, mtime_ns: int) -> _ExpectIndex:
+    return _build_expect_index(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def _build_expect_index(data: dict) -> _ExpectIndex:
+    items = {key: item for key, item in data.items() if item}
+    bounds = np.full((len(items), 2, 3), np.nan, dtype=np.float64)
+    has_bounds = np.zeros(len(items), dtype=bool)
+    for row, item in enumerate(items.values()):
+        if item.get("bounds") is not None:
+            bounds[row] = np.asarray(item["bounds"], dtype=np.float64)
+            has_bounds[row] = True
+    values = list(items.values())
+    return _ExpectIndex(
+        rows={key: row for row, key in enumerate(items)},
+        items=values,
+        faces=np.array([int(item.get("faces", 0)) for item in values], dtype=np.int64),
+        tol_faces=np.array([int(item.get("tol_faces", 0)) for item in values], dtype=np.int64),
+        volume=np.array([float(item.get("volume", 0.0)) for item in values], dtype=np.float64),
+        tol_volume=np.array([float(item.get("tol_volume", 0.0)) for item in values], dtype=np.float64),
+        bounds=bounds,
+        has_bounds=has_bounds,
+        tol_bounds=np.array([float(item.get("tol_bounds", 0.0)) for item in values], dtype=np.float64),
+    )
+
+
+def _is_layer_file(config: StencilConfig, name: str) -> bool:
+    # 与 pipeline 的匹配规则一致，含内置回退模式
+    return (
+        config.match_paste(name)
+        or config.match_outline(name)
+        or _match_paste_fallback(name)
+        or _match_outline_fallback(name)
+    )
+
+
+def _extract_layers(zf: zipfile.ZipFile, extract_dir: Path, config: StencilConfig) -> int:
+    # 只解压 pipeline 会读取的层，跳过丝印/钻孔等无关文件
+    count = 0
+    for info in zf.infolist():
+        if info.is_dir():
+            continue
+        name = info.filename.replace("\\", "/").rsplit("/", 1)[-1]
+        if not _is_layer_file(config, name):
+            continue
+        zf.extract(info, extract_dir)
+        count += 1
+    return count
+
+
+@dataclass(frozen=True, slots=True)
+class _ZipMeta:
+    size: int
+    mtime_ns: int
+    digest: bytes | None
+
+
+# (key, zip_path, zip_meta, output_stl)
+_SampleTask = tuple[str, Path, _ZipMeta, Path]
+
+
+def _list_samples(fixtures_dir: Path, with_digest: bool = True) -> list[tuple[str, Path, _ZipMeta]]:
+    # 每个 ZIP 只 stat/哈希一次，缓存键与调度排序都复用这里的结果
+    # os.scandir 的目录项自带类型信息，省去 Path.glob 的逐项 stat
+    found: list[tuple[str, str]] = []
+    try:
+        case_entries = os.scandir(fixtures_dir)
+    except FileNotFoundError:
+        return []
+    with case_entries:
+        for case_entry in case_entries:
+            if not (case_entry.name.startswith("case_") and case_entry.is_dir()):
+                continue
+            try:
+                zip_entries = os.scandir(os.path.join(case_entry.path, "input"))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with zip_entries:
+                for zip_entry in zip_entries:
+                    if zip_entry.name.endswith(".zip") and zip_entry.is_file():
+                        found.append((f"{case_entry.name}/{zip_entry.name}", zip_entry.path))
+    found.sort()
+    return [(key, Path(path), _zip_meta(Path(path), with_digest)) for key, path in found]
+
+
+def _zip_meta(zip_path: Path, with_digest: bool) -> _ZipMeta:
+    stat = zip_path.stat()
+    return _ZipMeta(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        digest=_zip_digest(zip_path) if with_digest else None,
+    )
+
+
+def _zip_digest(zip_path: Path) -> bytes:
+    if blake3 is not None:
+        # BLAKE3 内部多线程并行哈希，大 ZIP 不再受单核 SHA-256 吞吐限制
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(zip_path)
+        return hasher.digest()
+    h = hashlib.sha256()
+    with zip_path.open("rb") as fh:
+        if os.fstat(fh.fileno()).st_size > 0:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+    return h.digest()
+
+
+def _cache_key(zip_meta: _ZipMeta, config: StencilConfig) -> str:
+    # 按 ZIP 内容而非路径/mtime 寻址，checkout 或跨机器复制后缓存仍可命中
+    if zip_meta.digest is None:
+        raise ValueError("zip digest is required for the cache key")
+    return hashlib.sha256(_ZIP_DIGEST_ALGO + zip_meta.digest + config.digest).hexdigest()
+
+
+def _temp_sibling(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def _place_file(src: Path, dst: Path) -> None:
+    # 先硬链接（不支持时复制）到同目录临时文件，再 os.replace 原子替换，避免半写文件
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _temp_sibling(dst)
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    tmp = _temp_sibling(path)
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _dump_json(data, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def _extract_sample(zip_path: Path, config: StencilConfig, scratch_dir: Path) -> Path:
+    # 在本次运行共享的 scratch 目录下建子目录，省去每个样本创建/销毁临时根目录
+    extract_dir = scratch_dir / uuid.uuid4().hex
+    extract_dir.mkdir()
+    try:
+        with open(zip_path, "rb", buffering=_ZIP_READ_BUFFER) as fp, zipfile.ZipFile(fp, "r") as zf:
+            _extract_layers(zf, extract_dir, config)
+    except BaseException:
+        shutil.rmtree(extract_dir, ignore_errors=True)
+        raise
+    return extract_dir
+
+
+def _run_sample_task(
+    key: str,
+    zip_path: Path,
+    zip_meta: _ZipMeta,
+    output_stl: Path,
+    config: StencilConfig,
+    cache_dir: Path | None,
+    scratch_dir: Path,
+    prefetched: Future | None = None,
+    verbose: bool = False,
+) -> dict:
+    cache_key = None
+    cache_path = None
+    cache_stl = None
+    metrics = None
+    cache_hit = False
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_key = _cache_key(zip_meta, config)
+        cache_path = cache_dir / f"{cache_key}.json"
+        cache_stl = cache_dir / f"{cache_key}.stl"
+        if cache_path.exists() and (cache_stl.exists() or output_stl.exists()):
+            try:
+                cached = json.loads(cache_path.read_text(encoding="utf-8"))
+                metrics = cached.get("metrics")
+                if metrics is not None and cache_stl.exists():
+                    _place_file(cache_stl, output_stl)
+                cache_hit = metrics is not None
+            except Exception:
+                metrics = None
+    try:
+        if metrics is None:
+            if prefetched is not None:
+                extract_dir = prefetched.result()
+            else:
+                extract_dir = _extract_sample(zip_path, config, scratch_dir)
+            try:
+                output_stl.parent.mkdir(parents=True, exist_ok=True)
+                # 输出可能是缓存 STL 的硬链接，先断开再写，避免覆盖缓存内容
+                output_stl.unlink(missing_ok=True)
+                generate_stencil(extract_dir, output_stl, config)
+                metrics = _collect_metrics(output_stl)
+            finally:
+                shutil.rmtree(extract_dir, ignore_errors=True)
+            if cache_path is not None and cache_key is not None:
+                _place_file(output_stl, cache_stl)
+                _write_bytes_atomic(cache_path, _dump_json({"key": cache_key, "metrics": metrics}))
+        case_name = key.split("/", 1)[0]
+        return {
+            "case": case_name,
+            "sample": zip_path.name,
+            "zip_path": str(zip_path),
+            "output_stl": str(output_stl),
+            "success": True,
+            "metrics": metrics,
+            "expect": {},
+            "compare": None,
+            "from_cache": cache_hit,
+        }
+    except Exception as exc:
+        case_name = key.split("/", 1)[0]
+        result = {
+            "case": case_name,
+            "sample": zip_path.name,
+            "zip_path": str(zip_path),
+            "output_stl": str(output_stl),
+            "success": False,
+            "error": f"{type(exc).__name__}: {exc}"[:_ERROR_TEXT_LIMIT],
+        }
+        # 完整堆栈只在 --verbose 时格式化，避免每个失败样本都堆一份 traceback
+        if verbose:
+            result["trace"] = "".join(traceback.format_exception(exc, limit=_TRACE_FRAME_LIMIT))
+        return result
+
+
+def _compare_with_expect(results: list[dict], expect: _ExpectIndex, strict_expect: bool) -> None:
+    # 对所有成功样本一次性向量化比较，再回填每个结果的 compare/success
+    compared = []
+    rows = []
+    for result in results:
+        if "metrics" not in result:
+            continue
+        row = expect.rows.get(f"{result['case']}/{result['sample']}")
+        if row is None:
+            result["compare"] = {"matched": None, "reason": "no_expect"}
+            result["success"] = not strict_expect
+            continue
+        compared.append(result)
+        rows.append(row)
+    if not compared:
+        return
+
+    idx = np.asarray(rows, dtype=np.intp)
+    metrics = [result["metrics"] for result in compared]
+    act_faces = np.array([m["faces"] for m in metrics], dtype=np.int64)
+    act_volume = np.array([m["volume"] for m in metrics], dtype=np.float64)
+    act_has_bounds = np.array([m.get("bounds") is not None for m in metrics], dtype=bool)
+    act_bounds = np.full((len(metrics), 2, 3), np.nan, dtype=np.float64)
+    for i, m in enumerate(metrics):
+        if m.get("bounds") is not None:
+            act_bounds[i] = m["bounds"]
+
+    faces_ok = np.abs(expect.faces[idx] - act_faces) <= expect.tol_faces[idx]
+    volume_ok = np.abs(expect.volume[idx] - act_volume) <= expect.tol_volume[idx]
+    bounds_diff = np.max(np.abs(expect.bounds[idx] - act_bounds), axis=(1, 2))
+    check_bounds = expect.has_bounds[idx] & act_has_bounds
+    bounds_ok = ~check_bounds | (bounds_diff <= expect.tol_bounds[idx])
+    matched = faces_ok & volume_ok & bounds_ok
+
+    for i, result in enumerate(compared):
+        result["expect"] = expect.items[rows[i]]
+        result["compare"] = {
+            "matched": bool(matched[i]),
+            "reason": "ok" if matched[i] else "mismatch",
+            "checks": {
+                "faces_ok": bool(faces_ok[i]),
+                "volume_ok": bool(volume_ok[i]),
+                "bounds_ok": bool(bounds_ok[i]),
+            },
+        }
+        result["success"] = bool(matched[i])
+
+
+def _cache_ready(zip_meta: _ZipMeta, output_stl: Path, config: StencilConfig, cache_dir: Path) -> bool:
+    cache_key = _cache_key(zip_meta, config)
+    if not (cache_dir / f"{cache_key}.json").exists():
+        return False
+    return (cache_dir / f"{cache_key}.stl").exists() or output_stl.exists()
+
+
+def _run_serial(
+    tasks: list[_SampleTask],
+    config: StencilConfig,
+    cache_dir: Path | None,
+    scratch_dir: Path,
+    prefetch: bool = True,
+    verbose: bool = False,
+) -> list[dict]:
+    if not prefetch:
+        return [
+            _run_sample_task(key, zip_path, zip_meta, output_stl, config, cache_dir, scratch_dir, verbose=verbose)
+            for key, zip_path, zip_meta, output_stl in tasks
+        ]
+    results: list[dict] = []
+    # 单进程时用一个 I/O 线程预解压下一个样本，与当前样本的建模重叠
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="sfmesh_prefetch") as io_pool:
+        next_input = io_pool.submit(_extract_sample, tasks[0][1], config, scratch_dir) if tasks else None
+        for idx, (key, zip_path, zip_meta, output_stl) in enumerate(tasks):
+            current_input = next_input
+            if idx + 1 < len(tasks):
+                next_input = io_pool.submit(_extract_sample, tasks[idx + 1][1], config, scratch_dir)
+            try:
+                results.append(
+                    _run_sample_task(
+                        key,
+                        zip_path,
+                        zip_meta,
+                        output_stl,
+                        config,
+                        cache_dir,
+                        scratch_dir,
+                        current_input,
+                        verbose,
+                    )
+                )
+            finally:
+                # 预解压目录若未被使用（如缓存命中），这里统一清理
+                if current_input.exception() is None:
+                    shutil.rmtree(current_input.result(), ignore_errors=True)
+    return results
+
+
+def _run_parallel(
+    tasks: list[_SampleTask],
+    config: StencilConfig,
+    cache_dir: Path | None,
+    scratch_dir: Path,
+    jobs: int,
+    verbose: bool = False,
+) -> list[dict]:
+    # 大 ZIP 先提交（LPT 调度），避免大样本拖在队尾；结果最后会重新排序
+    tasks = sorted(tasks, key=lambda task: task[2].size, reverse=True)
+    results: list[dict] = []
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=_pool_context(), initializer=_worker_init) as pool:
+        futures = [
+            pool.submit(
+                _run_sample_task,
+                key,
+                zip_path,
+                zip_meta,
+                output_stl,
+                config,
+                cache_dir,
+                scratch_dir,
+                verbose=verbose,
+            )
+            for key, zip_path, zip_meta, output_stl in tasks
+        ]
+        for fut in as_completed(futures):
+            results.append(fut.result())
+    return results
+
+
+def run_regression(
+    fixtures_dir: Path,
+    output_dir: Path,
+    expect_path: Path,
+    strict_expect: bool,
+    quality_mode: str,
+    voxel_pitch_mm: float,
+    jobs: int,
+    use_cache: bool,
+    verbose: bool = False,
+) -> dict:
+    config = _default_config(quality_mode, voxel_pitch_mm)
+    config.validate()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = output_dir / ".cache" if use_cache else None
+
+    tasks: list[_SampleTask] = []
+    for key, zip_path, zip_meta in _list_samples(fixtures_dir, with_digest=cache_dir is not None):
+        case_name = key.split("/", 1)[0]
+        output_stl = output_dir / case_name / f"{zip_path.stem}.stl"
+        tasks.append((key, zip_path, zip_meta, output_stl))
+
+    # 预扫描缓存：命中的样本直接内联返回，只有未命中的才值得启动进程池
+    hits: list[_SampleTask] = []
+    misses: list[_SampleTask] = []
+    for task in tasks:
+        if cache_dir is not None and _cache_ready(task[2], task[3], config, cache_dir):
+            hits.append(task)
+        else:
+            misses.append(task)
+    scratch_dir = Path(tempfile.mkdtemp(prefix="sfmesh_regression_"))
+    try:
+        results = _run_serial(hits, config, cache_dir, scratch_dir, prefetch=False, verbose=verbose)
+        if jobs <= 1 or len(misses) <= 1:
+            results.extend(_run_serial(misses, config, cache_dir, scratch_dir, verbose=verbose))
+        else:
+            results.extend(_run_parallel(misses, config, cache_dir, scratch_dir, jobs, verbose))
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    _compare_with_expect(results, _load_expect(expect_path), strict_expect)
+    results.sort(key=lambda x: (x.get("case", ""), x.get("sample", "")))
+
+    success_count = sum(1 for r in results if r.get("success"))
+    watertight_count = sum(1 for r in results if r.get("metrics", {}).get("watertight"))
+    cached_count = sum(1 for r in results if r.get("from_cache"))
+    report = {
+        "total": len(results),
+        "success": success_count,
+        "failed": len(results) - success_count,
+        "watertight": watertight_count,
+        "cached": cached_count,
+        "strict_expect": strict_expect,
+        "quality_mode": quality_mode,
+        "voxel_pitch_mm": voxel_pitch_mm,
+        "jobs": jobs,
+        "cache": use_cache,
+        "results": results,
+    }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run sfmesh regression on fixture ZIPs.")
+    parser.add_argument("--fixtures", type=Path, default=Path("tests/fixtures/gerber"))
+    parser.add_argument("--output", type=Path, default=Path("tests/artifacts/sfmesh_regression"))
+    parser.add_argument("--expect", type=Path, default=Path("tests/fixtures/gerber/expect.json"))
+    parser.add_argument("--strict-expect", action="store_true")
+    parser.add_argument("--quality-mode", choices=["fast", "auto", "watertight"], default="fast")
+    parser.add_argument("--voxel-pitch-mm", type=float, default=0.08)
+    parser.add_argument("--jobs", type=int, default=max(1, min(4, (os.cpu_count() or 2) // 2)))
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    report = run_regression(
+        args.fixtures,
+        args.output,
+        args.expect,
+        args.strict_expect,
+        args.quality_mode,
+        args.voxel_pitch_mm,
+        args.jobs,
+        not args.no_cache,
+        args.verbose,
+    )
+    args.output.mkdir(parents=True, exist_ok=True)
+    summary_path = args.output / "summary.json"
+    summary_path.write_bytes(_dump_json(report, indent=True))
+
+    print(f"Total: {report['total']}  Success: {report['success']}  Failed: {report['failed']}")
+    print(f"Watertight: {report['watertight']} / {report['total']}")
+    print(f"Cached: {report['cached']} / {report['total']}  Jobs: {report['jobs']}")
+    print(f"Summary: {summary_path}")
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,7 +15,6 @@ from datetime import datetime
 from dataclasses import asdict
 from ctypes import Structure
 from ctypes import wintypes
-from fnmatch import fnmatch
 from pathlib import Path
 
 from PySide6.QtCore import QObject, Qt, QUrl, Signal, Slot, QCoreApplication
@@ -175,13 +174,12 @@ def _config_to_dict(config: StencilConfig) -> dict:
     }
 
 
-def _find_files(input_dir: Path, patterns: list[str]) -> list[Path]:
+def _find_files(input_dir: Path, config: StencilConfig) -> list[Path]:
     matches = []
     for path in input_dir.rglob("*"):
         if not path.is_file():
             continue
-        name = path.name.lower()
-        if any(fnmatch(name, pattern.lower()) for pattern in patterns):
+        if config.match_paste(path.name) or config.match_outline(path.name):
             matches.append(path)
     return sorted(matches)
 
@@ -392,7 +390,7 @@ class BackendBridge(QObject):
             self._log_line(f"Scan files: input path not found: {resolved}")
             self.filesScanned.emit({"files": []})
             return
-        files = _find_files(path, self._config.paste_patterns + self._config.outline_patterns)
+        files = _find_files(path, self._config)
         self._log_line(f"Scan files: {len(files)} matched in {resolved}")
         for file_path in files:
             self._log_line(f"  - {file_path.name}")
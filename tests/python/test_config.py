@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 
-from stencilforge.config import StencilConfig
+from stencilforge.config import StencilConfig, clear_config_cache
 
 
 def test_default_config_values() -> None:
@@ -88,3 +88,63 @@ def test_validation_errors(patch: dict, message: str) -> None:
     cfg = StencilConfig.from_dict(patch)
     with pytest.raises(ValueError, match=message):
         cfg.validate()
+
+
+def test_name_patterns_match_case_insensitively() -> None:
+    cfg = StencilConfig.from_dict({"paste_patterns": ["*gtp*"], "outline_patterns": ["*.gko"]})
+    assert cfg.match_paste("Gerber_TopPasteMaskLayer.GTP")
+    assert not cfg.match_paste("Gerber_TopLayer.GTL")
+    assert cfg.match_outline("Gerber_BoardOutlineLayer.GKO")
+    assert not cfg.match_outline("Gerber_BoardOutlineLayer.GKO.bak")
+
+
+def test_from_json_falls_back_to_defaults_on_bad_file(tmp_path) -> None:
+    good = tmp_path / "good.json"
+    good.write_text('{"thickness_mm": 0.2, "locator_mode": "wall"}', encoding="utf-8")
+    cfg = StencilConfig.from_json(good)
+    assert cfg.thickness_mm == 0.2
+    assert cfg.locator_mode == "wall"
+
+    padded = tmp_path / "padded.json"
+    padded.write_text('{"thickness_mm": 0.2}' + " " * 8192, encoding="utf-8")
+    assert StencilConfig.from_json(padded).thickness_mm == 0.2
+
+    bad = tmp_path / "bad.json"
+    bad.write_bytes(b"{not json\xff")
+    assert StencilConfig.from_json(bad) == StencilConfig.from_dict({})
+    assert StencilConfig.from_json(tmp_path / "missing.json") == StencilConfig.from_dict({})
+
+
+def test_load_default_reuses_parsed_config_until_file_changes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    clear_config_cache()
+    user_path = StencilConfig.default_path(tmp_path)
+    user_path.parent.mkdir(parents=True)
+    user_path.write_text('{"thickness_mm": 0.2}', encoding="utf-8")
+    first = StencilConfig.load_default(tmp_path)
+    assert StencilConfig.load_default(tmp_path) is first
+
+    user_path.write_text('{"thickness_mm": 0.25}', encoding="utf-8")
+    assert StencilConfig.load_default(tmp_path).thickness_mm == 0.25
+    clear_config_cache()
+
+
+def test_config_instances_are_slotted_and_hashable() -> None:
+    cfg = StencilConfig.from_dict({})
+    assert not hasattr(cfg, "__dict__")
+    assert hash(cfg) == hash(StencilConfig.from_dict({}))
+    assert cfg.digest != StencilConfig.from_dict({"thickness_mm": 0.2}).digest
+
+
+def test_load_default_seeds_user_config_from_bundled_copy(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("APPDATA", str(tmp_path / "user"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "user"))
+    clear_config_cache()
+    bundled = tmp_path / "project" / "config" / "stencilforge.json"
+    bundled.parent.mkdir(parents=True)
+    bundled.write_bytes(b'{"thickness_mm": 0.15}\n')
+    cfg = StencilConfig.load_default(tmp_path / "project")
+    assert cfg.thickness_mm == 0.15
+    assert StencilConfig.default_path(tmp_path).read_bytes() == bundled.read_bytes()
+    clear_config_cache()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from shapely.geometry import LineString, box
+from shapely.ops import unary_union
+
+from stencilforge.config import StencilConfig
+from stencilforge.geometry.outline import OutlineBuilder, _segment_coords
+
+
+def test_merge_near_colinear_segments_drops_overlaps() -> None:
+    builder = OutlineBuilder(StencilConfig.from_dict({}))
+    segments = [
+        LineString([(0, 0), (10, 0)]),
+        LineString([(7, 0.001), (2, 0)]),
+        LineString([(4, 0), (9, 0)]),
+        LineString([(0, 0), (0, 5)]),
+        LineString([(0, 5), (1, 6), (2, 5)]),
+    ]
+
+    merged = builder._merge_near_colinear_segments(segments, 0.01)
+
+    assert len(merged) == 3
+    xs = sorted(x for x, _ in merged[0].coords)
+    assert abs(xs[0]) < 1e-3 and abs(xs[1] - 10) < 1e-3
+    assert merged[1].equals(segments[3])
+    assert merged[2].equals(segments[4])
+
+
+def test_outline_evenodd_fills_nested_outlines() -> None:
+    builder = OutlineBuilder(StencilConfig.from_dict({}))
+    polygons = [
+        box(0, 0, 10, 10),
+        box(2, 2, 8, 8),
+        box(4, 4, 6, 6),
+        box(20, 0, 30, 10),
+        box(22, 2, 28, 8),
+    ]
+
+    filled = builder._outline_evenodd(polygons)
+
+    expected = unary_union([box(0, 0, 10, 10), box(20, 0, 30, 10), box(4, 4, 6, 6)])
+    expected = expected.difference(unary_union([box(2, 2, 8, 8), box(22, 2, 28, 8)]))
+    assert filled.is_valid
+    assert filled.symmetric_difference(expected).area < 1e-9
+
+
+def test_build_loops_in_order_follows_reversed_segments() -> None:
+    builder = OutlineBuilder(StencilConfig.from_dict({}))
+    segments = [
+        LineString([(0, 0), (10, 0)]),
+        LineString([(10, 10), (10, 0)]),
+        LineString([(10, 10), (0, 10)]),
+        LineString([(0, 0), (0, 10)]),
+    ]
+
+    loops = builder._build_loops_in_order(_segment_coords(segments), 0.01)
+
+    assert len(loops) == 1
+    assert list(loops[0].coords) == [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]